@@ -0,0 +1,21 @@
+# accounts/backends.py
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+UserModel = get_user_model()
+
+
+class ProfileModelBackend(ModelBackend):
+    """
+    ModelBackend that loads the session's user together with its
+    Profile (one JOINed query). AuthenticationMiddleware keeps that
+    user for the whole request, so the role checks in mixins, views,
+    API endpoints and templates all read the same `user.profile`
+    instead of each fetching it again.
+    """
+    def get_user(self, user_id):
+        try:
+            user = UserModel._default_manager.select_related("profile").get(pk=user_id)
+        except UserModel.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -4,6 +4,7 @@ from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 from django.forms import inlineformset_factory
 
+from elevate.uploads import UploadErrorsMixin
 from .models import Profile, Education, Experience
 
 # ---------- 1. Registration Form ----------
@@ -22,7 +23,7 @@ class RegisterForm(UserCreationForm):
 # ---------- 2. Main Profile Forms ----------
 INPUT_CLS = {"class": "input"}
 TEXTAREA_CLS = {"class": "textarea", "rows": 5}
-class BaseProfileForm(forms.ModelForm):
+class BaseProfileForm(UploadErrorsMixin, forms.ModelForm):
     class Meta:
         model = Profile
         fields = [
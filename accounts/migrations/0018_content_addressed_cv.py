@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:48
+
+import accounts.models
+import elevate.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_delete_university'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='cv',
+            field=models.FileField(blank=True, null=True, storage=elevate.storage.content_addressed_storage, upload_to=accounts.models.upload_cv),
+        ),
+    ]
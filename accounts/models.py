@@ -6,6 +6,8 @@ from wagtail.models import Page  # Not used here, but good practice
 from wagtail.admin.panels import FieldPanel
 from wagtail.snippets.models import register_snippet
 
+from elevate.storage import content_addressed_storage
+
 User = get_user_model()
 
 # --- File Upload Functions ---
@@ -46,7 +48,7 @@ class Profile(models.Model):
     website_url  = models.URLField(blank=True)
 
     # student-only 
-    cv = models.FileField(upload_to=upload_cv, blank=True, null=True)
+    cv = models.FileField(upload_to=upload_cv, storage=content_addressed_storage, blank=True, null=True)
     cover_letter = models.FileField(upload_to=upload_cover, blank=True, null=True)
 
     def __str__(self):
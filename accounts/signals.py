@@ -5,6 +5,9 @@
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+
+from elevate.cache_tags import INTERNSHIPS_LIST, company_tag, internship_tag, invalidate_tags
+from internships.models import Internship
 from .models import Profile
 
 User = get_user_model()
@@ -13,3 +16,16 @@ User = get_user_model()
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
         Profile.objects.create(user=instance)
+
+
+# A company's profile (name, logo) is shown on its internship cards and
+# detail pages, so saving it drops those from the cache.
+@receiver(post_save, sender=Profile)
+def invalidate_company_caches(sender, instance, **kwargs):
+    if not instance.is_company:
+        return
+    internship_ids = Internship.objects.filter(owner_id=instance.user_id).values_list("pk", flat=True)
+    invalidate_tags(
+        INTERNSHIPS_LIST, company_tag(instance.user_id),
+        *(internship_tag(pk) for pk in internship_ids),
+    )
@@ -53,3 +53,24 @@ def test_guest_is_redirected_from_profile():
     #    and that the redirect location is the login page.
     assert response.status_code == 302
     assert response.url.startswith('/accounts/login/')
+
+
+@pytest.mark.django_db
+def test_request_user_comes_with_its_profile(client):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    user = User.objects.create_user(username='sara', password='password')
+    user.profile.role = 'student'
+    user.profile.save()
+    client.force_login(user)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert client.get(reverse('student_browse')).status_code == 200
+    auth_queries = [
+        q["sql"] for q in queries.captured_queries
+        if 'FROM "auth_user"' in q["sql"] or 'FROM "accounts_profile"' in q["sql"]
+    ]
+    # One joined user+profile lookup, however often views and templates ask.
+    assert len(auth_queries) == 1
+    assert '"accounts_profile"' in auth_queries[0]
@@ -89,6 +89,11 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     def get_object(self, queryset=None):
         return self.request.user.profile
 
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["upload_errors"] = getattr(self.request, "upload_errors", None)
+        return kwargs
+
     def get_context_data(self, **kwargs):
         """
         This function loads the formsets and sends them to the template.
@@ -1,20 +1,32 @@
 # applications/forms.py
 from django import forms
+
+from elevate.uploads import UploadErrorsMixin
 from .models import Application
 
-class ApplicationCreateForm(forms.ModelForm):
+class ApplicationCreateForm(UploadErrorsMixin, forms.ModelForm):
+    # Apply with the CV already on the student's profile: the application
+    # points at the same stored file, nothing is uploaded or copied.
+    use_profile_cv = forms.BooleanField(required=False)
+
     class Meta:
         model = Application
         fields = ["cv", "cover_letter"]
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, profile=None, **kwargs):
         super().__init__(*args, **kwargs)
-        self.fields['cv'].required = True
+        self.profile = profile
+        self.fields['cv'].required = not self.wants_profile_cv()
+
+    def wants_profile_cv(self):
+        return bool(self.profile and self.profile.cv and self.data.get("use_profile_cv"))
 
     def clean_cv(self):
         f = self.cleaned_data.get("cv")
         
         # Check if a file was actually uploaded
+        if not f and self.wants_profile_cv():
+            return self.profile.cv.name
         if not f:
             raise forms.ValidationError("This field is required.") 
         if f.size > 5 * 1024 * 1024:  # 5MB
@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from applications.uploads import UPLOAD_EXPIRES, stale_uploads
+
+
+class Command(BaseCommand):
+    help = "Deletes direct uploads that were never claimed by an application."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="List the uploads without deleting them.")
+
+    def handle(self, *args, **options):
+        # Older than a ticket's lifetime: nothing is still uploading them.
+        cutoff = timezone.now() - timedelta(seconds=UPLOAD_EXPIRES)
+        deleted = 0
+        for key in stale_uploads(cutoff):
+            if options["dry_run"]:
+                self.stdout.write(key)
+            else:
+                default_storage.delete(key)
+            deleted += 1
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {deleted} unclaimed upload(s)."))
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from elevate.storage import is_referenced, unreferenced_blobs
+
+
+class Command(BaseCommand):
+    help = "Deletes content-addressed blobs (CVs) that no profile or application points at any more."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--min-age-hours", type=int, default=24,
+            help="Only delete blobs written at least this long ago (default: %(default)s).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="List the blobs without deleting them.")
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options["min_age_hours"])
+        deleted = 0
+        for name in unreferenced_blobs(cutoff):
+            # Checked again: a row may have started using it since the
+            # references were read.
+            if is_referenced(name):
+                continue
+            if options["dry_run"]:
+                self.stdout.write(name)
+            else:
+                default_storage.delete(name)
+            deleted += 1
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {deleted} unreferenced blob(s)."))
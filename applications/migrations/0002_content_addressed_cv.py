@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:48
+
+import applications.models
+import elevate.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='cv',
+            field=models.FileField(blank=True, null=True, storage=elevate.storage.content_addressed_storage, upload_to=applications.models.get_application_cv_path),
+        ),
+    ]
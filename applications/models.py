@@ -1,5 +1,7 @@
 # applications/models.py
-from django.db import models
+from django.db import models, transaction
+from elevate.cache_tags import company_tag, internship_tag, invalidate_tags
+from elevate.storage import content_addressed_storage
 from internships.models import Internship
 from django.contrib.auth import get_user_model
 import os # Import os to get the file extension
@@ -17,6 +19,29 @@ def get_application_cover_path(instance, filename):
     return f"applications/internship_{instance.internship.id}/student_{instance.student.id}/cover_letter{ext}"
 
 
+class ApplicationQuerySet(models.QuerySet):
+    def set_status(self, status):
+        """
+        Moves every application in this queryset to `status` with a
+        single UPDATE (ownership and filters stay in its WHERE clause).
+        Queryset updates skip the post_save counter handlers, so the
+        touched internships' counters are recounted in the same transaction,
+        and their cache tags invalidated.
+        Returns the number of applications changed.
+        """
+        changing = self.exclude(status=status)
+        with transaction.atomic():
+            touched = set(changing.order_by().values_list("internship_id", "internship__owner_id").distinct())
+            updated = changing.update(status=status)
+            if updated:
+                Internship.objects.filter(pk__in={pk for pk, _ in touched}).recount_applicants()
+                invalidate_tags(
+                    *{internship_tag(pk) for pk, _ in touched},
+                    *{company_tag(owner_id) for _, owner_id in touched},
+                )
+        return updated
+
+
 class Application(models.Model):
 
     STATUS_CHOICES = [
@@ -32,11 +57,21 @@ class Application(models.Model):
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='new')
     submitted_at = models.DateTimeField(auto_now_add=True)
 
-    cv = models.FileField(upload_to=get_application_cv_path, blank=True, null=True)
+    # Content-addressed: identical CVs (e.g. the profile CV reused for
+    # every application) are stored once, see elevate/storage.py.
+    cv = models.FileField(upload_to=get_application_cv_path, storage=content_addressed_storage, blank=True, null=True)
     cover_letter = models.FileField(upload_to=get_application_cover_path, blank=True, null=True)
 
+    objects = ApplicationQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.student.username}'s application for {self.internship.title}"
 
+    def save(self, *args, **kwargs):
+        # The post_save handler in applications/signals.py bumps the
+        # Internship counters; keep that in the same transaction.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         ordering = ['-submitted_at']
\ No newline at end of file
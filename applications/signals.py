@@ -0,0 +1,80 @@
+# applications/signals.py
+
+# Keeps the denormalized applicant counters on Internship in step with
+# the applications table. Every change is a single UPDATE with F()
+# expressions, so concurrent applications can't lose increments.
+
+from django.db.models import F
+from django.db.models.signals import post_init, pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from elevate.cache_tags import company_tag, internship_tag, invalidate_tags
+from internships.models import Internship
+from .models import Application
+
+
+def _status_field(status):
+    return f"{status}_count"
+
+
+@receiver(post_init, sender=Application)
+def remember_status(sender, instance, **kwargs):
+    # What the row had when it was loaded; lets post_save
+    # see status changes without re-reading the row.
+    # (Read from __dict__ so a deferred status isn't fetched here.)
+    instance._loaded_status = instance.__dict__.get("status")
+
+
+@receiver(pre_save, sender=Application)
+@receiver(pre_delete, sender=Application)
+def load_deferred_fields(sender, instance, **kwargs):
+    # Instances loaded with .only()/.defer() may lack what the
+    # handlers below need; fetch it while the row still exists.
+    if instance._state.adding:
+        return
+    if instance._loaded_status is None or "internship_id" not in instance.__dict__:
+        status, internship_id = (
+            Application.objects.filter(pk=instance.pk)
+            .values_list("status", "internship_id").get()
+        )
+        if instance._loaded_status is None:
+            instance._loaded_status = status
+        instance.__dict__.setdefault("internship_id", internship_id)
+
+
+@receiver(post_save, sender=Application)
+def count_application_on_save(sender, instance, created, **kwargs):
+    old_status = instance._loaded_status
+    new_status = instance.status
+
+    if created:
+        Internship.objects.filter(pk=instance.internship_id).update(
+            applicant_count=F("applicant_count") + 1,
+            **{_status_field(new_status): F(_status_field(new_status)) + 1},
+        )
+    elif old_status != new_status:
+        Internship.objects.filter(pk=instance.internship_id).update(**{
+            _status_field(old_status): F(_status_field(old_status)) - 1,
+            _status_field(new_status): F(_status_field(new_status)) + 1,
+        })
+
+    instance._loaded_status = new_status
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application_on_delete(sender, instance, **kwargs):
+    status = instance._loaded_status
+    Internship.objects.filter(pk=instance.internship_id).update(
+        applicant_count=F("applicant_count") - 1,
+        **{_status_field(status): F(_status_field(status)) - 1},
+    )
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_application_caches(sender, instance, **kwargs):
+    if Application.internship.is_cached(instance):
+        owner_id = instance.internship.owner_id
+    else:
+        owner_id = Internship.objects.filter(pk=instance.internship_id).values_list("owner_id", flat=True).first()
+    invalidate_tags(internship_tag(instance.internship_id), company_tag(owner_id))
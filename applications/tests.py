@@ -1,3 +1,303 @@
-from django.test import TestCase
+# applications/tests.py
+import hashlib
+import re
 
-# Create your tests here.
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+
+from internships.models import Internship
+from .models import Application
+from .uploads import presign_upload
+
+User = get_user_model()
+
+
+def make_user(username, role):
+    user = User.objects.create_user(username=username, password='password')
+    user.profile.role = role
+    user.profile.save()
+    return user
+
+
+@pytest.fixture(autouse=True)
+def media_storage(settings, tmp_path):
+    settings.STORAGES = {**settings.STORAGES, "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": str(tmp_path), "base_url": "/media/"},
+    }}
+    return tmp_path
+
+
+@pytest.fixture
+def job():
+    return Internship.objects.create(owner=make_user('acme', 'company'), title="Data Intern", description="x")
+
+
+@pytest.fixture
+def student():
+    return make_user('sara', 'student')
+
+
+PDF_SHA = hashlib.sha256(b"%PDF-1.7").hexdigest()
+
+
+def upload(client, ticket, content, name="cv.pdf"):
+    return client.post(ticket["url"], {**ticket["fields"], "file": SimpleUploadedFile(name, content)})
+
+
+@pytest.mark.django_db
+def test_direct_upload_then_apply_through_the_api(client, job, student):
+    client.force_login(student)
+    base = f"/api/ninja/internships/{job.pk}/apply"
+
+    ticket = client.post(f"{base}/upload", {"filename": "My CV.pdf", "size": 9}, content_type="application/json").json()
+    assert re.fullmatch(rf"applications/internship_{job.pk}/student_{student.pk}/[0-9a-f]{{32}}/cv\.pdf", ticket["key"])
+    assert upload(client, ticket, b"%PDF-1.7").status_code == 204
+
+    response = client.post(f"{base}/direct", {"cv_key": ticket["key"]}, content_type="application/json")
+    assert response.status_code == 200
+    application = Application.objects.get()
+    # Moved under its content hash, like a form upload.
+    assert application.cv.name == f"blobs/{PDF_SHA[:2]}/{PDF_SHA}.pdf"
+    assert default_storage.open(application.cv.name).read() == b"%PDF-1.7"
+    assert not default_storage.exists(ticket["key"])
+
+    # Once applied, no new ticket: the submitted CV can't be replaced.
+    response = client.post(f"{base}/upload", {"filename": "cv.pdf", "size": 9}, content_type="application/json")
+    assert response.status_code == 400
+    assert default_storage.open(application.cv.name).read() == b"%PDF-1.7"
+
+
+@pytest.mark.django_db
+def test_direct_upload_rejections(client, job, student):
+    client.force_login(student)
+    base = f"/api/ninja/internships/{job.pk}/apply"
+
+    assert client.post(f"{base}/upload", {"filename": "cv.exe", "size": 9}, content_type="application/json").status_code == 400
+    assert client.post(f"{base}/upload", {"filename": "cv.pdf", "size": 6 * 1024 * 1024}, content_type="application/json").status_code == 400
+
+    ticket = client.post(f"{base}/upload", {"kind": "cover_letter", "filename": "cl.pdf", "size": 10}, content_type="application/json").json()
+    assert upload(client, ticket, b"x" * (2 * 1024 * 1024 + 1)).status_code == 400
+    ticket["fields"]["key"] = "applications/internship_1/student_999/cover_letter.pdf"
+    assert upload(client, ticket, b"x").status_code == 403
+
+    # A key that belongs to someone else can't be claimed.
+    other = make_user('omar', 'student')
+    theirs = presign_upload(job, other, "cv", "cv.pdf", 5)
+    upload(client, theirs, b"%PDF-")
+    response = client.post(f"{base}/direct", {"cv_key": theirs["key"]}, content_type="application/json")
+    assert response.status_code == 400
+    assert not Application.objects.exists()
+
+    # Nor a key outside a ticket's random directory.
+    from .uploads import UploadRejected, claim_upload
+    for key in (
+        f"applications/internship_{job.pk}/student_{student.pk}/cv.pdf",
+        f"applications/internship_{job.pk}/student_{student.pk}/../cv.pdf",
+    ):
+        with pytest.raises(UploadRejected):
+            claim_upload(job, student, "cv", key)
+    assert presign_upload(job, student, "cv", "cv.pdf", 5)["key"] != presign_upload(job, student, "cv", "cv.pdf", 5)["key"]
+
+
+@pytest.mark.django_db
+def test_apply_view_accepts_uploaded_keys(client, job, student):
+    client.force_login(student)
+    ticket = presign_upload(job, student, "cv", "cv.docx", 5)
+    upload(client, ticket, b"PK\x03\x04", name="cv.docx")
+
+    response = client.post(reverse('student_apply', args=[job.pk]), {"cv_key": ticket["key"]})
+    assert response["Location"] == reverse('student_apps')
+    assert re.fullmatch(r"blobs/[0-9a-f]{2}/[0-9a-f]{64}\.docx", Application.objects.get().cv.name)
+
+
+@pytest.mark.django_db
+def test_direct_and_form_uploads_of_the_same_cv_share_a_blob(client, job, student, media_storage):
+    second = Internship.objects.create(owner=job.owner, title="Web Intern", description="x")
+    client.force_login(student)
+    client.post(f"/api/ninja/internships/{job.pk}/apply", {"cv": SimpleUploadedFile("resume.pdf", b"%PDF-1.7")})
+    ticket = presign_upload(second, student, "cv", "cv.pdf", 8)
+    upload(client, ticket, b"%PDF-1.7")
+    client.post(reverse('student_apply', args=[second.pk]), {"cv_key": ticket["key"]})
+
+    assert set(Application.objects.values_list("cv", flat=True)) == {f"blobs/{PDF_SHA[:2]}/{PDF_SHA}.pdf"}
+    assert [p.name for p in media_storage.rglob("*") if p.is_file()] == [f"{PDF_SHA}.pdf"]
+
+
+def test_upload_handlers_hash_files_as_they_stream_in(rf, settings):
+    body = b"%PDF-1.7" + b"x" * 4096
+    for max_memory in (settings.FILE_UPLOAD_MAX_MEMORY_SIZE, 1024):  # memory, then temp file
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE = max_memory
+        request = rf.post("/", {"cv": SimpleUploadedFile("cv.pdf", body)})
+        assert request.FILES["cv"].sha256 == hashlib.sha256(body).hexdigest()
+
+
+def test_s3_presigned_post_is_scoped_to_the_key():
+    from storages.backends.s3 import S3Storage
+
+    storage = S3Storage(
+        access_key="test", secret_key="test", bucket_name="elevate",
+        endpoint_url="http://minio.local:9000", location="media", default_acl="public-read",
+    )
+    internship, student = Internship(pk=12), User(pk=34)
+    ticket = presign_upload(internship, student, "cv", "resume.PDF", 1000, storage=storage)
+
+    assert re.fullmatch(r"applications/internship_12/student_34/[0-9a-f]{32}/cv\.PDF", ticket["key"])
+    assert ticket["url"].startswith("http://minio.local:9000/elevate")
+    assert ticket["fields"]["key"] == f"media/{ticket['key']}"
+    assert ticket["fields"]["Content-Type"] == "application/pdf"
+    assert "policy" in ticket["fields"]
+
+
+@pytest.mark.django_db
+def test_identical_cvs_are_stored_once(client, job, student, media_storage):
+    second = Internship.objects.create(owner=job.owner, title="Web Intern", description="x")
+    client.force_login(student)
+
+    for internship in (job, second):
+        response = client.post(
+            f"/api/ninja/internships/{internship.pk}/apply",
+            {"cv": SimpleUploadedFile("resume.pdf", b"%PDF-1.7 same bytes")},
+        )
+        assert response.status_code == 200
+
+    first, other = Application.objects.order_by("id")
+    assert first.cv.name == other.cv.name
+    assert first.cv.name.startswith("blobs/") and first.cv.name.endswith(".pdf")
+    assert len(list(media_storage.glob("blobs/*/*"))) == 1
+
+    # Deleting one application leaves the shared blob in place.
+    first.cv.delete(save=False)
+    assert default_storage.exists(other.cv.name)
+
+
+@pytest.mark.django_db
+def test_unreferenced_blobs_are_deleted(job, student, media_storage):
+    import io
+    from django.core.files.base import ContentFile
+    from django.core.management import call_command
+
+    student.profile.cv.save("mine.pdf", ContentFile(b"%PDF- shared"))
+    shared = Application.objects.create(internship=job, student=student, cv=student.profile.cv.name)
+    orphan = default_storage.save("blobs/ab/" + "ab" * 32 + ".pdf", ContentFile(b"%PDF- nobody's"))
+
+    # Too recent: could still be on its way into a row.
+    call_command("delete_unreferenced_blobs", stdout=io.StringIO())
+    assert default_storage.exists(orphan)
+
+    call_command("delete_unreferenced_blobs", "--min-age-hours=0", stdout=io.StringIO())
+    assert not default_storage.exists(orphan)
+    assert default_storage.exists(shared.cv.name)
+
+    # Still used by the application after the profile lets go of it.
+    student.profile.cv = None
+    student.profile.save()
+    call_command("delete_unreferenced_blobs", "--min-age-hours=0", stdout=io.StringIO())
+    assert default_storage.exists(shared.cv.name)
+
+    Application.objects.filter(pk=shared.pk).delete()
+    call_command("delete_unreferenced_blobs", "--min-age-hours=0", stdout=io.StringIO())
+    assert not default_storage.exists(shared.cv.name)
+
+
+@pytest.mark.django_db
+def test_apply_with_profile_cv(client, job, student):
+    from django.core.files.base import ContentFile
+
+    student.profile.cv.save("mine.pdf", ContentFile(b"%PDF- profile cv"))
+    client.force_login(student)
+
+    response = client.post(reverse('student_apply', args=[job.pk]), {"use_profile_cv": "on"})
+    assert response["Location"] == reverse('student_apps')
+    assert Application.objects.get().cv.name == student.profile.cv.name
+
+
+@pytest.mark.django_db
+def test_apply_with_profile_cv_and_uploaded_cover_letter(client, job, student):
+    from django.core.files.base import ContentFile
+
+    student.profile.cv.save("mine.pdf", ContentFile(b"%PDF- profile cv"))
+    client.force_login(student)
+    ticket = presign_upload(job, student, "cover_letter", "letter.pdf", 9)
+    upload(client, ticket, b"%PDF- hi", name="letter.pdf")
+
+    response = client.post(
+        reverse('student_apply', args=[job.pk]),
+        {"use_profile_cv": "on", "cover_letter_key": ticket["key"]},
+    )
+    assert response["Location"] == reverse('student_apps')
+    application = Application.objects.get()
+    assert application.cv.name == student.profile.cv.name
+    assert application.cover_letter.name == ticket["key"]
+
+
+@pytest.mark.django_db
+def test_unclaimed_uploads_are_deleted(client, job, student, media_storage):
+    import io
+    import os
+    import time
+    from django.core.management import call_command
+
+    client.force_login(student)
+    claimed = presign_upload(job, student, "cover_letter", "letter.pdf", 9)
+    upload(client, claimed, b"%PDF- hi", name="letter.pdf")
+    Application.objects.create(internship=job, student=student, cover_letter=claimed["key"])
+    abandoned = presign_upload(job, student, "cv", "cv.pdf", 9)
+    upload(client, abandoned, b"%PDF-1.7")
+
+    call_command("delete_stale_uploads", stdout=io.StringIO())
+    assert default_storage.exists(abandoned["key"])  # may still be claimed
+
+    hour_ago = time.time() - 3600
+    for ticket in (claimed, abandoned):
+        os.utime(media_storage / ticket["key"], (hour_ago, hour_ago))
+    call_command("delete_stale_uploads", stdout=io.StringIO())
+    assert not default_storage.exists(abandoned["key"])
+    assert default_storage.exists(claimed["key"])
+
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+
+
+@pytest.mark.django_db
+def test_upload_type_is_sniffed_not_trusted(client, job, student):
+    client.force_login(student)
+
+    # A PNG renamed to .pdf is refused on its bytes, on the form and the API.
+    response = client.post(reverse('student_apply', args=[job.pk]), {"cv": SimpleUploadedFile("cv.pdf", PNG)})
+    assert response.status_code == 200
+    assert response.context["form"].errors["cv"] == ["Only DOC/DOCX/PDF files are allowed."]
+
+    response = client.post(f"/api/ninja/internships/{job.pk}/apply", {"cv": SimpleUploadedFile("cv.pdf", PNG)})
+    assert response.status_code == 400
+    assert not Application.objects.exists()
+
+
+@pytest.mark.django_db
+def test_oversized_upload_is_stopped_while_streaming(client, job, student):
+    client.force_login(student)
+    too_big = SimpleUploadedFile("cv.pdf", b"%PDF-1.7" + b"0" * (5 * 1024 * 1024))
+
+    response = client.post(reverse('student_apply', args=[job.pk]), {"cv": too_big})
+    assert response.context["form"].errors["cv"] == ["File must be ≤ 5 MB."]
+    assert not Application.objects.exists()
+
+
+@pytest.mark.django_db
+def test_claim_sniffs_what_landed_in_storage(client, job, student):
+    """
+    Direct uploads skip SniffingUploadHandler (on S3 they never reach
+    Django), so a PNG stored under a .pdf key is caught when claimed.
+    """
+    from django.core.files.base import ContentFile
+    from .uploads import UploadRejected, claim_upload
+
+    key = presign_upload(job, student, "cv", "cv.pdf", len(PNG))["key"]
+    default_storage.save(key, ContentFile(PNG))
+
+    with pytest.raises(UploadRejected, match="Only DOC/DOCX/PDF files are allowed."):
+        claim_upload(job, student, "cv", key)
+    assert not default_storage.exists(key)
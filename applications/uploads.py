@@ -0,0 +1,188 @@
+# applications/uploads.py
+"""
+Direct-to-storage uploads for application files.
+
+Instead of streaming a CV through a Django worker, the client asks for
+an upload ticket (presign_upload), POSTs the file straight to object
+storage with it, then applies with the returned key (claim_upload).
+Django only ever sees the file's name, size and type.
+
+On S3/MinIO the ticket is a boto3 presigned POST, with the size and
+content type enforced by the bucket policy. Any other storage (local
+development, tests) gets the same ticket shape pointing at
+DirectUploadView, which checks a signed policy and writes the file.
+
+Uploads that are never claimed (the form was abandoned, the claim was
+rejected, the student had already applied) are removed by
+`python manage.py delete_stale_uploads`.
+"""
+import os
+import re
+import secrets
+
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.urls import reverse
+
+from elevate.storage import ContentAddressedStorage, is_s3_storage
+from elevate.uploads import COVER_LETTER_RULE, CV_RULE, SNIFF_BYTES, _sniffed_type
+from .models import Application, get_application_cover_path, get_application_cv_path
+
+UPLOAD_RULES = {
+    "cv": {"path": get_application_cv_path, "max_size": CV_RULE.max_size, "rule": CV_RULE},
+    "cover_letter": {"path": get_application_cover_path, "max_size": COVER_LETTER_RULE.max_size, "rule": COVER_LETTER_RULE},
+}
+ALLOWED_UPLOAD_TYPES = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+UPLOAD_EXPIRES = 10 * 60
+UPLOAD_POLICY_SALT = "applications.uploads.policy"
+# Each ticket gets its own random directory, so a ticket can only ever
+# write a new object, never one an application already points at.
+UPLOAD_TOKEN_RE = re.compile(r"[0-9a-f]{32}")
+
+
+class UploadRejected(ValueError):
+    pass
+
+
+def upload_key(internship, student, kind, filename, token=None):
+    """
+    The key a form upload would get (via the model's upload_to), with
+    a per-ticket random segment before the file name:
+    applications/internship_<id>/student_<id>/<token>/cv.pdf
+    """
+    path = UPLOAD_RULES[kind]["path"](Application(internship=internship, student=student), filename)
+    directory, name = path.rsplit("/", 1)
+    return f"{directory}/{token or secrets.token_hex(16)}/{name}"
+
+
+def check_upload(kind, filename, size):
+    """
+    Validates what the client says it will upload; returns the content type.
+    """
+    if kind not in UPLOAD_RULES:
+        raise UploadRejected(f"Unknown file kind '{kind}'")
+    content_type = ALLOWED_UPLOAD_TYPES.get(os.path.splitext(filename)[1].lower())
+    if content_type is None:
+        raise UploadRejected("Only PDF/DOC/DOCX allowed.")
+    max_size = UPLOAD_RULES[kind]["max_size"]
+    if not 0 < size <= max_size:
+        raise UploadRejected(f"File must be ≤ {max_size // (1024 * 1024)} MB.")
+    return content_type
+
+
+def presign_upload(internship, student, kind, filename, size, storage=default_storage):
+    """
+    Returns {"key", "url", "fields"}: POST `fields` plus the file (as
+    "file", last) to `url` as multipart/form-data.
+    """
+    content_type = check_upload(kind, filename, size)
+    key = upload_key(internship, student, kind, filename)
+    max_size = UPLOAD_RULES[kind]["max_size"]
+
+    if is_s3_storage(storage):
+        fields = {"Content-Type": content_type}
+        conditions = [{"Content-Type": content_type}, ["content-length-range", 1, max_size]]
+        acl = getattr(storage, "default_acl", None)
+        if acl:
+            fields["acl"] = acl
+            conditions.append({"acl": acl})
+        post = storage.connection.meta.client.generate_presigned_post(
+            storage.bucket_name, storage._normalize_name(key),
+            Fields=fields, Conditions=conditions, ExpiresIn=UPLOAD_EXPIRES,
+        )
+        return {"key": key, "url": post["url"], "fields": post["fields"]}
+
+    policy = signing.dumps(
+        {"key": key, "max_size": max_size, "content_type": content_type},
+        salt=UPLOAD_POLICY_SALT,
+    )
+    return {
+        "key": key,
+        "url": reverse("direct_upload"),
+        "fields": {"key": key, "Content-Type": content_type, "policy": policy},
+    }
+
+
+def load_upload_policy(policy):
+    try:
+        return signing.loads(policy, salt=UPLOAD_POLICY_SALT, max_age=UPLOAD_EXPIRES)
+    except signing.BadSignature as e:
+        raise UploadRejected("Invalid or expired upload policy") from e
+
+
+def claim_upload(internship, student, kind, key, storage=default_storage):
+    """
+    Checks that `key` is an upload this student may attach to this
+    internship, and that it landed in storage within the size limit and
+    really is one of the allowed file types.
+    Returns the name to assign to the FileField: the key itself, or for
+    a content-addressed field (the CV) the blob it was moved to.
+    """
+    if kind not in UPLOAD_RULES:
+        raise UploadRejected(f"Unknown file kind '{kind}'")
+    extension = os.path.splitext(key)[1].lower()
+    parts = key.split("/")
+    token = parts[-2] if len(parts) > 1 else ""
+    if (
+        extension not in ALLOWED_UPLOAD_TYPES or not UPLOAD_TOKEN_RE.fullmatch(token)
+        or key != upload_key(internship, student, kind, f"x{extension}", token=token)
+    ):
+        raise UploadRejected("This upload does not belong to this application.")
+    if not storage.exists(key):
+        raise UploadRejected("The file has not been uploaded.")
+    if storage.size(key) > UPLOAD_RULES[kind]["max_size"]:
+        storage.delete(key)
+        raise UploadRejected("The uploaded file is too large.")
+    # The bytes went straight to storage, past SniffingUploadHandler,
+    # so the type is checked here, on what actually landed.
+    rule = UPLOAD_RULES[kind]["rule"]
+    if _sniffed_type(_read_head(storage, key), key) not in rule.types:
+        storage.delete(key)
+        raise UploadRejected(f"Only {rule.describe_types()} files are allowed.")
+    if isinstance(Application._meta.get_field(kind).storage, ContentAddressedStorage):
+        # Deduplicated like a form upload (elevate/storage.py).
+        return ContentAddressedStorage(storage).adopt(key)
+    return key
+
+
+def _read_head(storage, key):
+    if is_s3_storage(storage):
+        # A ranged GET; S3File would download the whole object first.
+        obj = storage.connection.meta.client.get_object(
+            Bucket=storage.bucket_name, Key=storage._normalize_name(key),
+            Range=f"bytes=0-{SNIFF_BYTES - 1}",
+        )
+        return obj["Body"].read()
+    with storage.open(key) as f:
+        return f.read(SNIFF_BYTES)
+
+
+def stale_uploads(uploaded_before, storage=default_storage):
+    """
+    Yields the keys of direct uploads (the <token> directories from
+    upload_key) that no application points at, written before
+    `uploaded_before`.
+    """
+    root = "applications"
+    try:
+        internships = storage.listdir(root)[0]
+    except FileNotFoundError:  # nothing uploaded yet
+        return
+    for internship in internships:
+        for student in storage.listdir(f"{root}/{internship}")[0]:
+            folder = f"{root}/{internship}/{student}"
+            for token in storage.listdir(folder)[0]:
+                if not UPLOAD_TOKEN_RE.fullmatch(token):
+                    continue
+                for name in storage.listdir(f"{folder}/{token}")[1]:
+                    key = f"{folder}/{token}/{name}"
+                    if (
+                        storage.get_modified_time(key) < uploaded_before
+                        and not Application.objects.filter(Q(cv=key) | Q(cover_letter=key)).exists()
+                    ):
+                        yield key
@@ -1,3 +1,37 @@
-from django.shortcuts import render
+# applications/views.py
+from django.core.files.storage import default_storage
+from django.http import HttpResponse, HttpResponseBadRequest, HttpResponseForbidden
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 
-# Create your views here.
+from .uploads import UploadRejected, load_upload_policy
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class DirectUploadView(View):
+    """
+    Plays the part of an S3 presigned POST when the default storage
+    isn't S3 (see applications/uploads.py). Like S3 it trusts only the
+    signed policy, not the session, so it is CSRF-exempt.
+    """
+    def post(self, request):
+        try:
+            policy = load_upload_policy(request.POST.get("policy", ""))
+        except UploadRejected as e:
+            return HttpResponseForbidden(str(e))
+        if request.POST.get("key") != policy["key"] or request.POST.get("Content-Type") != policy["content_type"]:
+            return HttpResponseForbidden("The upload does not match its policy.")
+
+        upload = request.FILES.get("file")
+        rejected = getattr(request, "upload_errors", {}).get("file")
+        if rejected:
+            return HttpResponseBadRequest(rejected)
+        if upload is None or not 0 < upload.size <= policy["max_size"]:
+            return HttpResponseBadRequest("Missing or oversized file.")
+
+        # S3 semantics: the key is exact, a second upload replaces the first.
+        if default_storage.exists(policy["key"]):
+            default_storage.delete(policy["key"])
+        default_storage.save(policy["key"], upload)
+        return HttpResponse(status=204)
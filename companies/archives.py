@@ -0,0 +1,84 @@
+# companies/archives.py
+"""
+Streamed ZIP of the CVs and cover letters behind an applications list.
+
+zipfile writes to an unseekable sink here (it falls back to data
+descriptors when it can't tell()/seek()), and every file is copied from
+storage in fixed-size chunks, so a worker holds at most one chunk of
+one file however large the archive gets. Nothing is staged on disk.
+"""
+import os
+import zipfile
+from datetime import datetime
+
+from botocore.exceptions import ClientError
+from django.core.files.storage import default_storage
+
+from elevate.storage import file_chunks
+
+ZIP_CHUNK_SIZE = 64 * 1024
+
+
+class _ZipSink:
+    # What zipfile writes into; the generator below empties it
+    # after every chunk and hands the bytes to the response.
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        chunks, self.chunks = self.chunks, []
+        return chunks
+
+
+def application_files(queryset):
+    """
+    Yields (archive path, storage name) for every CV and cover letter
+    in `queryset`, laid out as in storage:
+    applications/internship_<id>/student_<id>/cv.pdf
+    """
+    rows = (
+        queryset.order_by("internship_id", "student_id")
+        .values_list("internship_id", "student_id", "cv", "cover_letter")
+        .iterator(chunk_size=500)
+    )
+    for internship_id, student_id, cv, cover_letter in rows:
+        folder = f"applications/internship_{internship_id}/student_{student_id}"
+        for stem, name in (("cv", cv), ("cover_letter", cover_letter)):
+            if name:
+                yield f"{folder}/{stem}{os.path.splitext(name)[1]}", name
+
+
+def stream_zip(files, storage=default_storage):
+    """
+    Yields the bytes of a ZIP holding `files` ((archive path, storage name)
+    pairs). Files missing from storage are left out.
+    """
+    sink = _ZipSink()
+    timestamp = datetime.now().timetuple()[:6]
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        for arcname, name in files:
+            # Storages open lazily (S3 only fails on the first read), so
+            # the first chunk is fetched before the entry header is
+            # written: a missing file is skipped, not left half-written.
+            chunks = file_chunks(storage, name, ZIP_CHUNK_SIZE)
+            try:
+                first = next(chunks, b"")
+            except (FileNotFoundError, OSError, ClientError):
+                continue
+            entry = zipfile.ZipInfo(arcname, date_time=timestamp)
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            with archive.open(entry, "w", force_zip64=True) as target:
+                target.write(first)
+                yield from sink.drain()
+                for chunk in chunks:
+                    target.write(chunk)
+                    yield from sink.drain()
+            yield from sink.drain()
+    yield from sink.drain()  # the central directory
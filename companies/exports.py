@@ -0,0 +1,64 @@
+# companies/exports.py
+"""
+Row generation for the applications export.
+
+Rows come straight from values_list() over a server-side cursor, so an
+export of 50k applications never holds more than one chunk of tuples,
+and CV links are built by string concatenation from a base URL worked
+out once instead of asking the storage backend for every row.
+"""
+import csv
+
+from django.core.files.storage import default_storage
+from django.utils.encoding import filepath_to_uri
+
+from applications.models import Application
+
+EXPORT_HEADER = ["Internship", "Student", "Email", "Status", "Submitted At", "CV URL"]
+EXPORT_COLUMNS = ("internship__title", "student__username", "student__email", "status", "submitted_at", "cv")
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def media_base_url(request=None):
+    """
+    URL prefix of the default storage (our MinIO bucket is public-read,
+    so a file's URL is just this plus its name), made absolute against
+    `request` when the storage serves relative URLs.
+    """
+    base = default_storage.url("")
+    if request is not None and base.startswith("/"):
+        base = request.build_absolute_uri(base)
+    return base
+
+
+def application_rows(queryset, media_base):
+    """
+    Yields EXPORT_HEADER, then one list per application in `queryset`.
+    """
+    statuses = dict(Application.STATUS_CHOICES)
+    yield EXPORT_HEADER
+    rows = queryset.values_list(*EXPORT_COLUMNS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for title, username, email, status, submitted_at, cv in rows:
+        yield [
+            title,
+            username,
+            email or "",
+            statuses.get(status, status),
+            submitted_at.isoformat(),
+            f"{media_base}{filepath_to_uri(cv)}" if cv else "",
+        ]
+
+
+class Echo:
+    # csv.writer wants a file; this one hands each line straight back.
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(Echo())
+    return (writer.writerow(row) for row in rows)
@@ -0,0 +1,24 @@
+# companies/filters.py
+from django.db.models import Q
+
+from applications.models import Application
+
+
+def filter_applications(qs, q="", status=""):
+    """
+    The search and status filters of the company application lists,
+    shared by the views and the background export task.
+    """
+    q = (q or "").strip()
+    if q:
+        qs = qs.filter(
+            Q(student__username__icontains=q) |
+            Q(student__email__icontains=q) |
+            Q(student__profile__full_name__icontains=q)
+        )
+
+    status_choices_dict = dict(Application._meta.get_field("status").choices)
+    if status in status_choices_dict:
+        qs = qs.filter(status=status)
+
+    return qs
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from companies.models import ExportJob
+
+
+class Command(BaseCommand):
+    help = "Deletes applicant exports, and their files, older than EXPORT_RETENTION_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=settings.EXPORT_RETENTION_DAYS,
+            help="Keep exports created within this many days (default: %(default)s).",
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        deleted = 0
+        # One by one so post_delete removes each file from storage.
+        for job in ExportJob.objects.filter(created_at__lt=cutoff).iterator():
+            job.delete()
+            deleted += 1
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} export(s)."))
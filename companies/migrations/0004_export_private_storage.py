@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-18 05:22
+
+import companies.models
+import elevate.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0003_export_job'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='exportjob',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=elevate.storage.private_storage, upload_to=companies.models.get_export_path),
+        ),
+    ]
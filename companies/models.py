@@ -1,2 +1,70 @@
+import uuid
+
+from django.contrib.auth import get_user_model
 from django.db import models
 
+from elevate.storage import private_storage
+from internships.models import Internship
+
+User = get_user_model()
+
+
+def get_export_path(instance, filename):
+    # exports/<random>/applications.xlsx, in the private storage;
+    # only ExportDownloadView hands the file out.
+    return f"exports/{uuid.uuid4().hex}/{filename}"
+
+
+class ExportJob(models.Model):
+    """
+    An applications export generated in the background by
+    companies.tasks.run_export; the owner polls it until it's done.
+    """
+    FORMAT_CHOICES = [
+        ('csv', 'CSV'),
+        ('xlsx', 'Excel (XLSX)'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="export_jobs")
+    # None = applications across all of the owner's internships.
+    internship = models.ForeignKey(Internship, on_delete=models.CASCADE, null=True, blank=True, related_name="+")
+    q = models.CharField(max_length=200, blank=True)
+    status_filter = models.CharField(max_length=10, blank=True)
+    format = models.CharField(max_length=4, choices=FORMAT_CHOICES, default='csv')
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to=get_export_path, storage=private_storage, blank=True, null=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.get_format_display()} export #{self.pk} for {self.owner.username}"
+
+    @property
+    def is_finished(self):
+        return self.status in ('done', 'failed')
+
+    @property
+    def progress(self):
+        """Percent of rows written, 0-100."""
+        if self.status == 'done':
+            return 100
+        return int(self.processed * 100 / self.total) if self.total else 0
+
+    def filename(self):
+        scope = f"applications_{self.internship_id}" if self.internship_id else "all_applications"
+        return f"{scope}.{self.format}"
+
+    class Meta:
+        ordering = ['-created_at']
+
@@ -0,0 +1,15 @@
+# companies/signals.py
+
+# Removes an export's file from storage along with its ExportJob row,
+# including when the owner or the internship is deleted.
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import ExportJob
+
+
+@receiver(post_delete, sender=ExportJob)
+def delete_export_file(sender, instance, **kwargs):
+    if instance.file:
+        instance.file.delete(save=False)
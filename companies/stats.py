@@ -0,0 +1,32 @@
+# companies/stats.py
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from elevate.cache_compute import get_or_compute
+from elevate.cache_tags import company_tag
+from internships.models import Internship
+
+DASHBOARD_STATS_TIMEOUT = 60 * 10
+
+
+def compute_dashboard_stats(owner_id):
+    """
+    Posting and applicant totals for one company, in one aggregate
+    over the denormalized counters on Internship.
+    """
+    return Internship.objects.filter(owner_id=owner_id).aggregate(
+        postings=Count("id"),
+        active=Count("id", filter=Q(is_active=True)),
+        applicants=Coalesce(Sum("applicant_count"), 0),
+        new=Coalesce(Sum("new_count"), 0),
+    )
+
+
+def get_dashboard_stats(owner):
+    # Dropped with the company:<id> tag whenever one of the company's
+    # internships or applications changes.
+    return get_or_compute(
+        f"companies:dashboard_stats:{owner.pk}",
+        lambda: compute_dashboard_stats(owner.pk),
+        DASHBOARD_STATS_TIMEOUT, tags=(company_tag(owner.pk),),
+    )
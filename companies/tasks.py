@@ -0,0 +1,84 @@
+# companies/tasks.py
+"""
+Background jobs (django-tasks) for the company dashboard.
+Run by `python manage.py db_worker`, never inside a web request.
+"""
+import csv
+import io
+import tempfile
+
+from django.core.files import File
+from django.utils import timezone
+from django_tasks import task
+
+from applications.models import Application
+from .exports import application_rows, media_base_url
+from .filters import filter_applications
+from .models import ExportJob
+
+# How often (in rows) the job's progress is written back.
+PROGRESS_EVERY = 1000
+
+
+def _write_csv(rows, f):
+    text = io.TextIOWrapper(f, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    for row in rows:
+        writer.writerow(row)
+    text.flush()
+    text.detach()  # leave `f` open for the upload
+
+
+def _write_xlsx(rows, f):
+    from openpyxl import Workbook
+
+    # write_only streams rows out to the sheet XML as they're appended.
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Applications")
+    for row in rows:
+        sheet.append(row)
+    workbook.save(f)
+
+
+WRITERS = {"csv": _write_csv, "xlsx": _write_xlsx}
+
+
+def _with_progress(job, rows):
+    for n, row in enumerate(rows):  # row 0 is the header
+        yield row
+        if n and n % PROGRESS_EVERY == 0:
+            ExportJob.objects.filter(pk=job.pk).update(processed=n)
+
+
+@task()
+def run_export(job_id):
+    job = ExportJob.objects.select_related("owner").get(pk=job_id)
+
+    qs = Application.objects.filter(internship__owner=job.owner)
+    if job.internship_id:
+        qs = qs.filter(internship_id=job.internship_id)
+    qs = filter_applications(qs, q=job.q, status=job.status_filter)
+
+    # Everything after the job leaves "pending" is inside the try, so
+    # any failure marks it failed instead of leaving it "running".
+    try:
+        job.status = "running"
+        job.total = qs.count()
+        job.save(update_fields=["status", "total"])
+
+        with tempfile.TemporaryFile() as f:
+            # No request here, so filesystem-storage links stay relative.
+            rows = application_rows(qs, media_base_url())
+            WRITERS[job.format](_with_progress(job, rows), f)
+            f.seek(0)
+            job.file.save(job.filename(), File(f), save=False)
+    except Exception as e:
+        job.status, job.error = "failed", str(e)
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "error", "finished_at"])
+        raise
+
+    job.status, job.processed = "done", job.total
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "processed", "file", "finished_at"])
+    return job.pk
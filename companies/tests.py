@@ -1,3 +1,301 @@
-from django.test import TestCase
+# companies/tests.py
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
 
-# Create your tests here.
+from applications.models import Application
+from internships.models import Internship
+
+User = get_user_model()
+
+
+def make_user(username, role):
+    user = User.objects.create_user(username=username, password='password')
+    user.profile.role = role
+    user.profile.save()
+    return user
+
+
+@pytest.fixture
+def company():
+    return make_user('acme', 'company')
+
+
+@pytest.fixture
+def applications(company):
+    job = Internship.objects.create(owner=company, title="Data Intern", description="x")
+    return [
+        Application.objects.create(internship=job, student=make_user(name, 'student'))
+        for name in ('sara', 'omar', 'lina')
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_status_updates_selected_own_applications_in_one_update(client, company, applications):
+    rival = make_user('globex', 'company')
+    theirs = Application.objects.create(
+        internship=Internship.objects.create(owner=rival, title="Other", description="x"),
+        student=make_user('noor', 'student'),
+    )
+    client.force_login(company)
+
+    ids = [applications[0].pk, applications[1].pk, theirs.pk]
+    with CaptureQueriesContext(connection) as queries:
+        response = client.post(reverse('company_application_bulk_status'), {"status": "review", "ids": ids})
+    assert response.status_code == 302
+
+    updates = [q for q in queries if q["sql"].startswith('UPDATE "applications_application"')]
+    assert len(updates) == 1
+    assert Application.objects.get(pk=theirs.pk).status == 'new'
+    assert sorted(Application.objects.filter(status='review').values_list('pk', flat=True)) == sorted(ids[:2])
+
+    job = applications[0].internship
+    job.refresh_from_db()
+    assert (job.new_count, job.review_count) == (1, 2)
+
+
+@pytest.mark.django_db
+def test_bulk_status_can_target_everything_matching_the_filter(client, company, applications):
+    client.force_login(company)
+    job = applications[0].internship
+    page = client.get(reverse('company_applications', args=[job.pk]), {"q": "sara"})
+    assert b'id="bulk-status-form"' in page.content
+    assert client.get(reverse('company_all_applications')).status_code == 200
+
+    url = reverse('company_application_bulk_status') + "?q=sara"
+    response = client.post(url, {"status": "accepted", "scope": "matching", "internship": job.pk})
+    assert response["Location"] == reverse('company_applications', args=[job.pk]) + "?q=sara"
+    assert list(Application.objects.filter(status='accepted')) == [applications[0]]
+
+
+@pytest.mark.django_db
+def test_application_lists_render_one_status_form_per_row(client, company, applications):
+    client.force_login(company)
+    job = applications[0].internship
+    for url in (reverse('company_applications', args=[job.pk]), reverse('company_all_applications')):
+        html = client.get(url).content.decode()
+        assert html.count("btn-sm status-save-button") == len(applications)
+        assert html.count("<form") == html.count("</form>")
+
+
+@pytest.mark.django_db
+def test_htmx_status_change_returns_just_the_row(client, company, applications):
+    client.force_login(company)
+    app = applications[0]
+
+    response = client.post(
+        reverse('company_application_status', args=[app.pk]),
+        {"status": "rejected"}, HTTP_HX_REQUEST='true',
+    )
+    assert response.status_code == 200
+    assert response.content.decode().lstrip().startswith(f'<div id="application-{app.pk}"')
+    app.refresh_from_db()
+    assert app.status == 'rejected'
+
+
+@pytest.mark.django_db
+def test_csv_export_streams_filtered_rows(client, company, applications, settings, tmp_path):
+    settings.STORAGES = {**settings.STORAGES, "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": str(tmp_path), "base_url": "/media/"},
+    }}
+    job = applications[0].internship
+    Application.objects.filter(pk=applications[0].pk).update(
+        cv=f"applications/internship_{job.pk}/student_{applications[0].student_id}/cv.pdf",
+    )
+    client.force_login(company)
+    url = reverse('company_applications_export', args=[job.pk])
+
+    response = client.get(url)
+    assert response.streaming
+    lines = b"".join(response.streaming_content).decode().splitlines()
+    assert lines[0] == "Internship,Student,Email,Status,Submitted At,CV URL"
+    assert len(lines) == 4
+    sara = next(line for line in lines if ",sara," in line)
+    assert sara.endswith(f"http://testserver/media/applications/internship_{job.pk}/student_{applications[0].student_id}/cv.pdf")
+
+    lines = b"".join(client.get(url, {"q": "omar"}).streaming_content).decode().splitlines()
+    assert [line.split(",")[1] for line in lines[1:]] == ["omar"]
+
+
+@pytest.fixture
+def media_storage(settings, tmp_path):
+    settings.STORAGES = {**settings.STORAGES, "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": str(tmp_path), "base_url": "/media/"},
+    }, "private": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": str(tmp_path / "private")},
+    }}
+    return tmp_path
+
+
+@pytest.mark.django_db
+def test_background_xlsx_export(client, company, applications, media_storage, settings, django_capture_on_commit_callbacks):
+    import io
+    from openpyxl import load_workbook
+    from .models import ExportJob
+
+    client.force_login(company)
+    job_pk = applications[0].internship_id
+
+    # Queued for the db_worker: the request returns at once.
+    response = client.post(reverse('company_export_start'), {"format": "xlsx", "internship": job_pk})
+    assert response.status_code == 202
+    assert response.json()["status"] == "pending"
+
+    settings.TASKS = {"default": {"BACKEND": "django_tasks.backends.immediate.ImmediateBackend"}}
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            reverse('company_export_start'),
+            {"format": "xlsx", "internship": job_pk, "q": "sara"}, HTTP_HX_REQUEST='true',
+        )
+    assert b'hx-trigger="every 2s"' in response.content
+
+    export = ExportJob.objects.get(status="done")
+    poll = client.get(reverse('company_export_status', args=[export.pk]), HTTP_HX_REQUEST='true')
+    assert b"Download applications_" in poll.content and b"hx-trigger" not in poll.content
+    status = client.get(reverse('company_export_status', args=[export.pk])).json()
+    assert (status["progress"], status["total"]) == (100, 1)
+
+    # Streamed by the view from the private storage, never redirected
+    # to a media URL.
+    assert (media_storage / "private" / export.file.name).exists()
+    assert not (media_storage / export.file.name).exists()
+    download = client.get(status["download_url"])
+    assert download.status_code == 200
+    assert download["Content-Disposition"] == f'attachment; filename="applications_{job_pk}.xlsx"'
+    sheet = load_workbook(io.BytesIO(b"".join(download.streaming_content)), read_only=True).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert rows[0][0] == "Internship"
+    assert [row[1] for row in rows[1:]] == ["sara"]
+
+    other = make_user('globex', 'company')
+    client.force_login(other)
+    assert client.get(reverse('company_export_status', args=[export.pk])).status_code == 404
+
+
+@pytest.mark.django_db
+def test_export_ignores_unknown_status_filters(client, company, applications):
+    from .models import ExportJob
+
+    client.force_login(company)
+    for status in ("accepted", "x" * 50):
+        client.post(reverse('company_export_start'), {"format": "csv", "status": status})
+    assert sorted(ExportJob.objects.values_list("status_filter", flat=True)) == ["", "accepted"]
+
+
+@pytest.mark.django_db
+def test_delete_old_exports_removes_rows_and_files(company, media_storage):
+    import io
+    from datetime import timedelta
+    from django.core.files.base import ContentFile
+    from django.core.management import call_command
+    from django.utils import timezone
+    from .models import ExportJob
+
+    old, recent = ExportJob.objects.create(owner=company), ExportJob.objects.create(owner=company)
+    for job in (old, recent):
+        job.file.save("applications.csv", ContentFile(b"Internship\n"))
+    ExportJob.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=8))
+
+    call_command("delete_old_exports", stdout=io.StringIO())
+
+    assert list(ExportJob.objects.all()) == [recent]
+    assert not (media_storage / "private" / old.file.name).exists()
+    assert (media_storage / "private" / recent.file.name).exists()
+
+
+@pytest.mark.django_db
+def test_zip_of_application_files_streams_filtered_set(client, company, applications, media_storage):
+    import io
+    import zipfile
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import default_storage
+
+    job = applications[0].internship
+    for app in applications[:2]:
+        folder = f"applications/internship_{job.pk}/student_{app.student_id}"
+        cv = default_storage.save(f"{folder}/cv_x1.pdf", ContentFile(f"cv of {app.student.username}".encode()))
+        Application.objects.filter(pk=app.pk).update(cv=cv)
+    Application.objects.filter(pk=applications[1].pk).update(
+        cover_letter=default_storage.save(f"applications/internship_{job.pk}/student_{applications[1].student_id}/cover_letter.docx", ContentFile(b"hello")),
+    )
+    client.force_login(company)
+    url = reverse('company_applications_files', args=[job.pk])
+
+    response = client.get(url)
+    assert response.streaming and response["Content-Type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+    folder = f"applications/internship_{job.pk}/student_{applications[0].student_id}"
+    assert sorted(archive.namelist()) == sorted([
+        f"{folder}/cv.pdf",
+        f"applications/internship_{job.pk}/student_{applications[1].student_id}/cv.pdf",
+        f"applications/internship_{job.pk}/student_{applications[1].student_id}/cover_letter.docx",
+    ])
+    assert archive.read(f"{folder}/cv.pdf") == b"cv of sara"
+
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(client.get(url, {"q": "sara"}).streaming_content)))
+    assert archive.namelist() == [f"{folder}/cv.pdf"]
+
+
+@pytest.mark.django_db
+def test_dashboard_stats_are_cached_until_the_company_changes(client, company, applications):
+    from django.core.cache import cache
+    from .stats import get_dashboard_stats
+
+    cache.clear()
+    assert get_dashboard_stats(company) == {"postings": 1, "active": 1, "applicants": 3, "new": 3}
+    with CaptureQueriesContext(connection) as queries:
+        get_dashboard_stats(company)
+    assert len(queries) == 0
+
+    Application.objects.filter(pk=applications[0].pk).set_status('accepted')
+    assert get_dashboard_stats(company)["new"] == 2
+
+    client.force_login(company)
+    assert b"3 applicants across your postings, 2 new" in client.get(reverse('company_postings')).content
+
+
+def test_zip_skips_files_a_lazy_storage_cannot_read(tmp_path):
+    """
+    Like S3, this storage's open() always succeeds and a missing file
+    only fails on read(); the archive must still be complete.
+    """
+    import io
+    import zipfile
+    from django.core.files.base import ContentFile
+    from django.core.files.storage import FileSystemStorage
+    from .archives import stream_zip
+
+    class LazyFile:
+        def __init__(self, storage, name):
+            self.storage, self.name, self.file = storage, name, None
+
+        def read(self, size=-1):
+            if self.file is None:
+                self.file = FileSystemStorage.open(self.storage, self.name, "rb")
+            return self.file.read(size)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            if self.file:
+                self.file.close()
+
+    class LazyStorage(FileSystemStorage):
+        def open(self, name, mode="rb"):
+            return LazyFile(self, name)
+
+    storage = LazyStorage(location=str(tmp_path))
+    storage.save("a.pdf", ContentFile(b"first"))
+    storage.save("c.pdf", ContentFile(b"third"))
+
+    files = [("a.pdf", "a.pdf"), ("b.pdf", "missing.pdf"), ("c.pdf", "c.pdf")]
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(stream_zip(files, storage=storage))))
+    assert archive.testzip() is None
+    assert archive.namelist() == ["a.pdf", "c.pdf"]
+    assert archive.read("c.pdf") == b"third"
@@ -6,7 +6,12 @@ from .views import (
     InternshipCreateView,
     InternshipUpdateView,
     ApplicationStatusUpdateView,
+    ApplicationBulkStatusView,
     CompanyApplicationsCSVView,
+    CompanyApplicationsZipView,
+    ExportStartView,
+    ExportStatusView,
+    ExportDownloadView,
 )
 
 
@@ -24,6 +29,7 @@ urlpatterns = [
 
 urlpatterns += [
     path("applications/<int:pk>/status/", ApplicationStatusUpdateView.as_view(), name="company_application_status"),
+    path("applications/status/bulk/", ApplicationBulkStatusView.as_view(), name="company_application_bulk_status"),
 ]
 
 
@@ -33,6 +39,16 @@ urlpatterns += [
         CompanyApplicationsCSVView.as_view(),
         name="company_applications_export",
     ),
+    path(
+        "internships/<int:pk>/applications/files/",
+        CompanyApplicationsZipView.as_view(),
+        name="company_applications_files",
+    ),
 ]
 
 
+urlpatterns += [
+    path("exports/", ExportStartView.as_view(), name="company_export_start"),
+    path("exports/<int:pk>/", ExportStatusView.as_view(), name="company_export_status"),
+    path("exports/<int:pk>/download/", ExportDownloadView.as_view(), name="company_export_download"),
+]
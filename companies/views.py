@@ -1,37 +1,42 @@
 # companies/views.py
 from django.db import models
-from django.db.models import Q, Count
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import get_object_or_404, redirect, render
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.views.generic import ListView, CreateView, UpdateView
 from django.views import View
-from django.http import HttpResponse
-import csv
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 
 from django.views.decorators.cache import never_cache
 from django.utils.decorators import method_decorator
 
 from accounts.mixins import RoleRequiredMixin
+from elevate.pagination import CursorPaginationMixin
+from elevate.storage import file_chunks
 from internships.models import Internship
 from applications.models import Application
 from applications.forms import ApplicationStatusForm   
+from .archives import application_files, stream_zip
+from .exports import EXPORT_CONTENT_TYPES, application_rows, csv_lines, media_base_url
+from .filters import filter_applications
 from .forms import InternshipForm
+from .models import ExportJob
+from .stats import get_dashboard_stats
+from .tasks import run_export
 
 
 
 @method_decorator(never_cache, name='dispatch')
-class CompanyPostingsView(RoleRequiredMixin, LoginRequiredMixin, ListView):
+class CompanyPostingsView(CursorPaginationMixin, RoleRequiredMixin, LoginRequiredMixin, ListView):
     required_role = "company"
     template_name = "companies/postings.html" 
     context_object_name = "internships"
     model = Internship
     paginate_by = 6 
     def get_queryset(self):
-        qs = Internship.objects.filter(owner=self.request.user).order_by("-posted_at")
-        self.total_count = qs.count() 
-        qs = qs.annotate(applicant_count=Count('applications')) 
+        qs = Internship.objects.filter(owner=self.request.user).for_cards().order_by("-posted_at")
+        self.stats = get_dashboard_stats(self.request.user)
         q = self.request.GET.get("q", "")
         remote_filter = self.request.GET.get("remote_filter", "")
         if q: qs = qs.filter(title__icontains=q)
@@ -40,7 +45,8 @@ class CompanyPostingsView(RoleRequiredMixin, LoginRequiredMixin, ListView):
         return qs
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["total_count"] = self.total_count 
+        ctx["total_count"] = self.stats["postings"]
+        ctx["stats"] = self.stats
         ctx["q"] = self.request.GET.get("q", "")
         ctx["remote_filter"] = self.request.GET.get("remote_filter", "")
         return ctx
@@ -82,21 +88,11 @@ class ApplicationFilterMixin:
         """
         Applies search and status filters to a base queryset.
         """
-        q = self.request.GET.get("q", "").strip()
-        status_value = self.request.GET.get("status", "")
-
-        if q:
-            base_qs = base_qs.filter(
-                Q(student__username__icontains=q) |
-                Q(student__email__icontains=q) |
-                Q(student__profile__full_name__icontains=q)
-            )
-
-        status_choices_dict = dict(Application._meta.get_field("status").choices)
-        if status_value in status_choices_dict:
-            base_qs = base_qs.filter(status=status_value)
-        
-        return base_qs
+        return filter_applications(
+            base_qs,
+            q=self.request.GET.get("q", ""),
+            status=self.request.GET.get("status", ""),
+        )
 
     def get_context_data(self, **kwargs):
         """
@@ -107,15 +103,17 @@ class ApplicationFilterMixin:
         ctx["status"] = self.request.GET.get("status", "")
         status_choices = [("", "All")] + Application._meta.get_field("status").choices
         ctx["status_choices"] = status_choices
+        ctx["bulk_status_choices"] = Application.STATUS_CHOICES
         return ctx
     
 @method_decorator(never_cache, name='dispatch')
-class CompanyAllApplicationsView(ApplicationFilterMixin, RoleRequiredMixin, LoginRequiredMixin, ListView):
+class CompanyAllApplicationsView(CursorPaginationMixin, ApplicationFilterMixin, RoleRequiredMixin, LoginRequiredMixin, ListView):
     required_role = "company"
     template_name = "companies/all_applications.html"
     context_object_name = "applications"
     model = Application
     paginate_by = 20
+    cursor_ordering = ("-submitted_at", "-id")
     def get_queryset(self):
         base_qs = (
             Application.objects
@@ -128,12 +126,13 @@ class CompanyAllApplicationsView(ApplicationFilterMixin, RoleRequiredMixin, Logi
         return super().get_context_data(**kwargs)
 
 @method_decorator(never_cache, name='dispatch')
-class CompanyApplicationsView(ApplicationFilterMixin, RoleRequiredMixin, LoginRequiredMixin, ListView):
+class CompanyApplicationsView(CursorPaginationMixin, ApplicationFilterMixin, RoleRequiredMixin, LoginRequiredMixin, ListView):
     required_role = "company"
     template_name = "companies/applications.html"
     context_object_name = "applications"
     model = Application
     paginate_by = 20
+    cursor_ordering = ("-submitted_at", "-id")
     def get_queryset(self):
         pk = self.kwargs["pk"]
         self.base_queryset = (
@@ -145,9 +144,9 @@ class CompanyApplicationsView(ApplicationFilterMixin, RoleRequiredMixin, LoginRe
         return self.get_filtered_queryset(qs)
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        ctx["total_applicants_count"] = self.base_queryset.count()
         ctx["posting_id"] = self.kwargs["pk"]
         ctx["internship"] = get_object_or_404(Internship, pk=self.kwargs["pk"], owner=self.request.user)
+        ctx["total_applicants_count"] = ctx["internship"].applicant_count
         return ctx
 
 @method_decorator(never_cache, name='dispatch')
@@ -165,6 +164,18 @@ class ApplicationStatusUpdateView(RoleRequiredMixin, LoginRequiredMixin, View):
         )
 
         form = ApplicationStatusForm(request.POST, instance=app)
+        if request.htmx:
+            # Swap just this row instead of reloading the list.
+            if form.is_valid():
+                form.save()
+            else:
+                app.refresh_from_db(fields=["status"])
+            return render(request, "companies/partials/_application_row.html", {
+                "app": app,
+                "show_internship": bool(request.POST.get("show_internship")),
+                "status_choices": [("", "All")] + Application.STATUS_CHOICES,
+            })
+
         if form.is_valid():
             form.save()
             messages.success(request, "Application status updated.")
@@ -184,6 +195,46 @@ class ApplicationStatusUpdateView(RoleRequiredMixin, LoginRequiredMixin, View):
         # Otherwise, send them to the default "all applications" page
         return redirect("company_all_applications")
 
+@method_decorator(never_cache, name='dispatch')
+class ApplicationBulkStatusView(ApplicationFilterMixin, RoleRequiredMixin, LoginRequiredMixin, View):
+    """
+    Sets one status on many applications at once: either the ticked
+    `ids`, or (scope=matching) everything the list's current filters
+    match. The list's query string is forwarded on the form action, so
+    ApplicationFilterMixin sees the same q/status the list did.
+    """
+    required_role = "company"
+
+    def post(self, request):
+        status = request.POST.get("status", "")
+        internship_pk = request.POST.get("internship", "")
+
+        qs = Application.objects.filter(internship__owner=request.user)
+        if internship_pk.isdigit():
+            qs = qs.filter(internship__pk=internship_pk)
+            back = reverse("company_applications", kwargs={"pk": internship_pk})
+        else:
+            back = reverse("company_all_applications")
+        if request.GET:
+            back = f"{back}?{request.GET.urlencode()}"
+
+        if status not in dict(Application.STATUS_CHOICES):
+            messages.error(request, "Invalid status value.")
+            return redirect(back)
+
+        if request.POST.get("scope") == "matching":
+            qs = self.get_filtered_queryset(qs)
+        else:
+            ids = [i for i in request.POST.getlist("ids") if i.isdigit()]
+            if not ids:
+                messages.error(request, "No applications selected.")
+                return redirect(back)
+            qs = qs.filter(pk__in=ids)
+
+        updated = qs.set_status(status)
+        messages.success(request, f"Updated the status of {updated} application(s).")
+        return redirect(back)
+
 @method_decorator(never_cache, name='dispatch')
 class CompanyApplicationsCSVView(ApplicationFilterMixin, RoleRequiredMixin, LoginRequiredMixin, ListView):
     required_role = "company"
@@ -198,33 +249,115 @@ class CompanyApplicationsCSVView(ApplicationFilterMixin, RoleRequiredMixin, Logi
             base_qs = (
                 Application.objects
                 .filter(internship__pk=pk, internship__owner=self.request.user)
-                .select_related("student", "internship")
             )
         else:
             # This is for ALL internships
             base_qs = (
                 Application.objects
                 .filter(internship__owner=self.request.user)
-                .select_related("student", "internship")
             )
         
         # 2. Apply filters from the mixin
         apps = self.get_filtered_queryset(base_qs)
 
-        # 3. Create the CSV
+        # 3. Stream the CSV, one chunk of rows at a time
         filename = f'applications_{pk}.csv' if pk else 'all_applications.csv'
-        resp = HttpResponse(content_type="text/csv")
+        resp = StreamingHttpResponse(
+            csv_lines(application_rows(apps, media_base_url(request))),
+            content_type="text/csv",
+        )
         resp["Content-Disposition"] = f'attachment; filename="{filename}"'
-        
-        writer = csv.writer(resp)
-        writer.writerow(["Internship", "Student", "Email", "Status", "Submitted At", "CV URL"])
-        for a in apps:
-            writer.writerow([
-                a.internship.title,
-                a.student.username,
-                getattr(a.student, "email", ""),
-                a.get_status_display(),
-                a.submitted_at.isoformat(),
-                (request.build_absolute_uri(a.cv.url) if a.cv else ""),
-            ])
-        return resp
\ No newline at end of file
+        return resp
+
+
+
+@method_decorator(never_cache, name='dispatch')
+class CompanyApplicationsZipView(ApplicationFilterMixin, RoleRequiredMixin, LoginRequiredMixin, View):
+    """
+    Streams a ZIP of the CVs and cover letters for one posting,
+    limited to the list's current search/status filter.
+    """
+    required_role = "company"
+
+    def get(self, request, pk):
+        internship = get_object_or_404(Internship, pk=pk, owner=request.user)
+        apps = self.get_filtered_queryset(Application.objects.filter(internship=internship))
+        resp = StreamingHttpResponse(stream_zip(application_files(apps)), content_type="application/zip")
+        resp["Content-Disposition"] = f'attachment; filename="applications_{pk}_files.zip"'
+        return resp
+
+class ExportJobStatusMixin:
+    def render_job(self, job, status=200):
+        """
+        The polling partial for HTMX, JSON for everyone else.
+        """
+        if self.request.htmx:
+            return render(self.request, "companies/partials/_export_status.html", {"job": job}, status=status)
+        return JsonResponse({
+            "id": job.pk,
+            "status": job.status,
+            "progress": job.progress,
+            "processed": job.processed,
+            "total": job.total,
+            "download_url": reverse("company_export_download", kwargs={"pk": job.pk}) if job.status == "done" else None,
+        }, status=status)
+
+
+@method_decorator(never_cache, name='dispatch')
+class ExportStartView(ExportJobStatusMixin, RoleRequiredMixin, LoginRequiredMixin, View):
+    """
+    Queues a CSV/XLSX export of the (filtered) applications list and
+    answers straight away; companies.tasks.run_export does the work.
+    """
+    required_role = "company"
+
+    def post(self, request):
+        internship = None
+        internship_pk = request.POST.get("internship", "")
+        if internship_pk:
+            internship = get_object_or_404(Internship, pk=internship_pk, owner=request.user)
+        export_format = request.POST.get("format", "csv")
+        if export_format not in dict(ExportJob.FORMAT_CHOICES):
+            return JsonResponse({"message": "Unknown export format"}, status=400)
+
+        # Anything but a real status means "all", as in filter_applications.
+        status_filter = request.POST.get("status", "")
+        if status_filter not in dict(Application.STATUS_CHOICES):
+            status_filter = ""
+
+        job = ExportJob.objects.create(
+            owner=request.user,
+            internship=internship,
+            q=request.POST.get("q", "").strip()[:200],
+            status_filter=status_filter,
+            format=export_format,
+        )
+        run_export.enqueue(job.pk)
+        job.refresh_from_db()  # a synchronous task backend may already be done
+        return self.render_job(job, status=202)
+
+
+@method_decorator(never_cache, name='dispatch')
+class ExportStatusView(ExportJobStatusMixin, RoleRequiredMixin, LoginRequiredMixin, View):
+    required_role = "company"
+
+    def get(self, request, pk):
+        return self.render_job(get_object_or_404(ExportJob, pk=pk, owner=request.user))
+
+
+@method_decorator(never_cache, name='dispatch')
+class ExportDownloadView(RoleRequiredMixin, LoginRequiredMixin, View):
+    required_role = "company"
+
+    def get(self, request, pk):
+        job = get_object_or_404(ExportJob, pk=pk, owner=request.user)
+        if job.status != "done" or not job.file:
+            raise Http404("This export is not ready.")
+        # Exports live in the private storage and have no public URL;
+        # they are only ever streamed from here, to their owner.
+        resp = StreamingHttpResponse(
+            file_chunks(job.file.storage.storage, job.file.name),
+            content_type=EXPORT_CONTENT_TYPES[job.format],
+        )
+        resp["Content-Disposition"] = f'attachment; filename="{job.filename()}"'
+        return resp
@@ -1,10 +1,14 @@
 # elevate/api.py
-from typing import List, Union
+import json
+from typing import Dict, List, Union
 from datetime import date
-from ninja import Field, ModelSchema, NinjaAPI, Schema, File
+from ninja import Field, ModelSchema, NinjaAPI, Schema, File, Form
 from ninja.files import UploadedFile 
 from wagtail.models import Page
 from wagtail.rich_text import expand_db_html
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
 from django.contrib.auth.hashers import make_password, check_password
@@ -13,11 +17,21 @@ from django.contrib.auth.hashers import make_password, check_password
 from ninja.security import SessionAuth
 
 
+from internships import autocomplete
+from internships.bulk import build_internships, bulk_create_internships
+from internships.facets import get_facet_counts
+from internships.filters import BrowseFilters
 from internships.models import Internship
+from internships.search import rank_internships, resolve_sort
+from elevate.cache_policy import CachePolicy
+from elevate.cache_tags import INTERNSHIPS_LIST
+from elevate.conditional import conditional_get, make_etag
+from elevate.pagination import CursorPaginator, InvalidCursor
 from website.models import AboutPage
 from accounts.models import Profile, Education, Experience
 from applications.models import Application
 from applications.forms import ApplicationCreateForm
+from applications.uploads import UploadRejected, claim_upload, presign_upload
 
 # --- Wagtail API Router (This is correct) ---
 from wagtail.api.v2.views import PagesAPIViewSet
@@ -42,10 +56,32 @@ class MessageSchema(Schema):
     message: str
 
 class InternshipSchema(ModelSchema):
+    # Only annotated (see InternshipQuerySet.with_applied) for students.
+    applied: bool = False
     class Config:
         model = Internship
         model_fields = ['id', 'title', 'location', 'is_remote', 'description', 'deadline']
 
+class InternshipListSchema(Schema):
+    """
+    InternshipSchema for the list endpoint, where every field is
+    optional so `fields=` can leave columns out of the payload.
+    """
+    id: int = None
+    title: str = None
+    location: str = None
+    is_remote: bool = None
+    description: str = None
+    deadline: date = None
+    applied: bool = None
+
+INTERNSHIP_LIST_FIELDS = list(InternshipListSchema.__fields__)
+
+class AutocompleteSchema(Schema):
+    titles: List[str] = None
+    locations: List[str] = None
+    companies: List[str] = None
+
 class InternshipCreateSchema(Schema):
     title: str
     location: str
@@ -53,6 +89,30 @@ class InternshipCreateSchema(Schema):
     description: str
     deadline: date = None
 
+class UploadRequestSchema(Schema):
+    kind: str = "cv"  # "cv" or "cover_letter"
+    filename: str
+    size: int
+
+class UploadTicketSchema(Schema):
+    key: str
+    url: str
+    fields: Dict[str, str]
+
+class DirectApplySchema(Schema):
+    cv_key: str
+    cover_letter_key: str = None
+
+class BulkInternshipResultSchema(Schema):
+    # One per submitted item, in order: `id` once created, else `errors`.
+    index: int
+    id: int = None
+    errors: Dict[str, List[str]] = None
+
+class BulkInternshipResponseSchema(Schema):
+    created: int
+    results: List[BulkInternshipResultSchema]
+
 class EducationSchema(ModelSchema):
     class Config:
         model = Education
@@ -113,20 +173,148 @@ class AboutPageSchema(BasePageSchema):
     @staticmethod
     def resolve_body(page: AboutPage) -> str:
         # We add 'context' as the second argument, which Ninja expects
-        return expand_db_html(page.body)
+        # body is a StreamField: render its blocks to HTML first.
+        return expand_db_html(str(page.body))
+
+# -----------------------------------------------
+# Pagination
+# -----------------------------------------------
+
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+
+def paginate(response: HttpResponse, qs, cursor, limit, ordering=("-posted_at", "-id")):
+    """
+    Returns one keyset page of `qs`. The body stays a plain list;
+    the cursors for the neighbouring pages go out as headers.
+    Raises InvalidCursor for a tampered or malformed cursor.
+    """
+    limit = max(1, min(limit, API_MAX_PAGE_SIZE))
+    page = CursorPaginator(qs, limit, ordering).page(cursor)
+    if page.next_cursor:
+        response["X-Next-Cursor"] = page.next_cursor
+    if page.previous_cursor:
+        response["X-Previous-Cursor"] = page.previous_cursor
+    return page.object_list
+
+def listing_etag(request, qs):
+    """
+    Validator for an internship listing: row count and newest update
+    of the matching set (one aggregate query), plus the student's own
+    applications since those drive the `applied` flags.
+
+    There is deliberately no Last-Modified: a posting that is
+    deactivated or deleted leaves the set without moving its newest
+    update forward, so If-Modified-Since alone would keep answering
+    304. The count in the ETag does change.
+    """
+    stamp = qs.order_by().aggregate(count=Count("id"), updated=Max("updated_at"))
+    parts = [stamp["count"], stamp["updated"]]
+    if request.user.is_authenticated and request.user.profile.is_student:
+        mine = Application.objects.filter(student=request.user).aggregate(
+            count=Count("id"), last=Max("submitted_at"),
+        )
+        parts += [request.user.pk, mine["count"], mine["last"]]
+    return make_etag(*parts)
+
+# Anonymous listings are the same for everyone. The ETag goes into the
+# key as well, so an entry never outlives the rows it was built from.
+LISTING_API_CACHE = CachePolicy(
+    "api_internships", 60 * 10, vary=(), tags=(INTERNSHIPS_LIST,), audiences=("anonymous",),
+)
+LISTING_API_HEADERS = ("X-Next-Cursor", "X-Previous-Cursor", "X-Facet-Counts")
 
 # -----------------------------------------------
 # API Endpoints
 # -----------------------------------------------
 
 # --- Public Endpoints ---
-@api.get("/internships", response=List[InternshipSchema], auth=None)
-def list_internships(request):
-    return Internship.objects.filter(is_active=True)
+@api.get("/internships", response={200: List[InternshipListSchema], 400: MessageSchema}, auth=None, exclude_unset=True)
+def list_internships(
+    request, response: HttpResponse,
+    q: str = None, loc: str = None, comp: str = None, remote: bool = None,
+    sort: str = None, cursor: str = None, limit: int = API_PAGE_SIZE,
+    fields: str = None, facets: bool = False,
+):
+    """
+    Same filters as the student browse page. `fields` is a comma-separated
+    subset of InternshipListSchema (e.g. "id,title"); only those columns
+    are loaded and returned.
+    """
+    selected = [f.strip() for f in fields.split(",") if f.strip()] if fields else INTERNSHIP_LIST_FIELDS
+    unknown = [f for f in selected if f not in INTERNSHIP_LIST_FIELDS]
+    if unknown:
+        return 400, {"message": f"Unknown field '{unknown[0]}'"}
+
+    filters = BrowseFilters.from_params({
+        "q": q, "loc": loc, "comp": comp,
+        "remote_filter": "" if remote is None else str(int(remote)),
+    })
+    qs = filters.apply(Internship.objects.filter(is_active=True))
+    etag = listing_etag(request, qs)
+    not_modified = conditional_get(request, response, etag, private=request.user.is_authenticated)
+    if not_modified:
+        return not_modified
+
+    cache_key = LISTING_API_CACHE.key(request, etag) if LISTING_API_CACHE.applies_to(request) else None
+    cached = cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        headers, body = cached
+        for header, value in headers.items():
+            response[header] = value
+        return 200, body
+
+    ordering = ("-posted_at", "-id")
+    if resolve_sort(filters.q, sort) == "relevance":
+        qs = rank_internships(qs, filters.q)
+        ordering = ("-relevance", "-id")
+    # The cursor is built from the ordering columns, so they are loaded too.
+    columns = {"id", *(f.lstrip("-") for f in ordering if f != "-relevance")}
+    qs = qs.only(*columns, *(f for f in selected if f != "applied"))
+    if "applied" in selected and request.user.is_authenticated and request.user.profile.is_student:
+        qs = qs.with_applied(request.user)
+    if facets:
+        # Same counts as the browse filter bar, as JSON in a header
+        # so the body stays a plain list.
+        response["X-Facet-Counts"] = json.dumps(get_facet_counts(filters))
+    try:
+        page = paginate(response, qs, cursor, limit, ordering)
+    except InvalidCursor:
+        return 400, {"message": "Invalid cursor"}
+    # `applied` is only annotated for students; everyone else gets False.
+    body = [{f: getattr(job, f, False) for f in selected} for job in page]
+    if cache_key:
+        headers = {h: response[h] for h in LISTING_API_HEADERS if response.has_header(h)}
+        cache.set(cache_key, (headers, body), LISTING_API_CACHE.ttl)
+    return 200, body
+
+AUTOCOMPLETE_FIELDS = {"title": "titles", "location": "locations", "company": "companies"}
+
+@api.get("/autocomplete", response={200: AutocompleteSchema, 400: MessageSchema}, auth=None)
+def autocomplete_filters(request, q: str, field: str = None, limit: int = 8):
+    """
+    Prefix suggestions for the browse filters, answered from the
+    in-process index in internships/autocomplete.py.
+    """
+    if field and field not in AUTOCOMPLETE_FIELDS:
+        return 400, {"message": f"Unknown field '{field}'"}
+    fields = [AUTOCOMPLETE_FIELDS[field]] if field else list(AUTOCOMPLETE_FIELDS.values())
+    limit = max(1, min(limit, 20))
+    return 200, autocomplete.index.search(q.strip(), fields, limit)
 
 @api.get("/pages/about", response=AboutPageSchema, auth=None) 
-def get_about_page(request):
-    return get_object_or_404(AboutPage.objects.live(), slug='about-us').specific
+def get_about_page(request, response: HttpResponse):
+    # The live revision id changes on every publish, so it is enough
+    # to answer a revalidation without loading the page itself.
+    pages = AboutPage.objects.live().filter(slug='about-us')
+    stamp = get_object_or_404(pages.values('pk', 'live_revision_id', 'last_published_at'))
+    not_modified = conditional_get(
+        request, response, make_etag(stamp['pk'], stamp['live_revision_id']),
+        stamp['last_published_at'],
+    )
+    if not_modified:
+        return not_modified
+    return pages.get(pk=stamp['pk']).specific
 
 # --- Secured Profile Endpoints ---
 @api.get("/profile/me", response={200: Union[StudentProfileSchema, CompanyProfileSchema], 401: MessageSchema, 403: MessageSchema})
@@ -135,17 +323,20 @@ def get_my_profile(request):
 
 # --- Secured Student Endpoints ---
 @api.post("/internships/{internship_id}/apply", response={200: MessageSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema})
-def apply_for_internship(request, internship_id: int, cv: UploadedFile = File(...), cover_letter: UploadedFile = File(None)):
+def apply_for_internship(request, internship_id: int, cv: UploadedFile = File(None), cover_letter: UploadedFile = File(None), use_profile_cv: bool = Form(False)):
     if not request.user.profile.is_student:
         return 403, {"message": "Only students can apply"}
     internship = get_object_or_404(Internship, id=internship_id, is_active=True)
     if Application.objects.filter(internship=internship, student=request.user).exists():
         return 400, {"message": "You have already applied to this internship"}
-    form_data = {} 
-    form_files = {'cv': cv}
+    form_data = {"use_profile_cv": "on"} if use_profile_cv else {}
+    form_files = {'cv': cv} if cv else {}
     if cover_letter:
         form_files['cover_letter'] = cover_letter
-    form = ApplicationCreateForm(form_data, form_files)
+    form = ApplicationCreateForm(
+        form_data, form_files, profile=request.user.profile,
+        upload_errors=getattr(request, "upload_errors", None),
+    )
     if not form.is_valid():
         return 400, {"message": f"Invalid file: {form.errors.as_text()}"}
     application = form.save(commit=False)
@@ -154,12 +345,46 @@ def apply_for_internship(request, internship_id: int, cv: UploadedFile = File(..
     application.save()
     return 200, {"message": "Application submitted successfully"}
 
-@api.get("/profile/me/applications", response={200: List[ApplicationSchema], 401: MessageSchema, 403: MessageSchema})
-def get_my_applications(request):
+@api.post("/internships/{internship_id}/apply/upload", response={200: UploadTicketSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema})
+def request_application_upload(request, internship_id: int, payload: UploadRequestSchema):
+    """
+    Step 1 of a direct upload: returns where and how to POST the file
+    (straight to object storage); step 2 is apply_with_uploads.
+    """
+    if not request.user.profile.is_student:
+        return 403, {"message": "Only students can apply"}
+    internship = get_object_or_404(Internship, id=internship_id, is_active=True)
+    if Application.objects.filter(internship=internship, student=request.user).exists():
+        return 400, {"message": "You have already applied to this internship"}
+    try:
+        return 200, presign_upload(internship, request.user, payload.kind, payload.filename, payload.size)
+    except UploadRejected as e:
+        return 400, {"message": str(e)}
+
+@api.post("/internships/{internship_id}/apply/direct", response={200: MessageSchema, 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema})
+def apply_with_uploads(request, internship_id: int, payload: DirectApplySchema):
+    if not request.user.profile.is_student:
+        return 403, {"message": "Only students can apply"}
+    internship = get_object_or_404(Internship, id=internship_id, is_active=True)
+    if Application.objects.filter(internship=internship, student=request.user).exists():
+        return 400, {"message": "You have already applied to this internship"}
+    try:
+        cv = claim_upload(internship, request.user, "cv", payload.cv_key)
+        cover_letter = payload.cover_letter_key and claim_upload(internship, request.user, "cover_letter", payload.cover_letter_key)
+    except UploadRejected as e:
+        return 400, {"message": f"Invalid file: {e}"}
+    Application.objects.create(internship=internship, student=request.user, cv=cv, cover_letter=cover_letter or None)
+    return 200, {"message": "Application submitted successfully"}
+
+@api.get("/profile/me/applications", response={200: List[ApplicationSchema], 400: MessageSchema, 401: MessageSchema, 403: MessageSchema})
+def get_my_applications(request, response: HttpResponse, cursor: str = None, limit: int = API_PAGE_SIZE):
     if not request.user.profile.is_student:
         return 403, {"message": "Only students have applications"}
     apps = Application.objects.filter(student=request.user).select_related('internship', 'student__profile')
-    return apps
+    try:
+        return 200, paginate(response, apps, cursor, limit, ("-submitted_at", "-id"))
+    except InvalidCursor:
+        return 400, {"message": "Invalid cursor"}
 
 # --- Secured Company Endpoints ---
 @api.post("/internships", response={200: InternshipSchema, 401: MessageSchema, 403: MessageSchema})
@@ -173,19 +398,50 @@ def create_internship(request, payload: InternshipCreateSchema):
     )
     return internship
 
-@api.get("/profile/me/internships", response={200: List[InternshipSchema], 401: MessageSchema, 403: MessageSchema})
-def get_my_internships(request):
+BULK_CREATE_MAX_ITEMS = 1000
+
+@api.post("/internships/bulk", response={200: BulkInternshipResponseSchema, 400: Union[BulkInternshipResponseSchema, MessageSchema], 401: MessageSchema, 403: MessageSchema})
+def create_internships_bulk(request, payload: List[InternshipCreateSchema]):
+    """
+    Creates many internships at once, all or nothing: if any item fails
+    model validation nothing is inserted and the 400 lists the errors
+    per item; otherwise every item is inserted in batched INSERTs.
+    """
+    if not request.user.profile.is_company:
+        return 403, {"message": "You do not have permission to post internships"}
+    if len(payload) > BULK_CREATE_MAX_ITEMS:
+        return 400, {"message": f"At most {BULK_CREATE_MAX_ITEMS} internships per request"}
+    internships, errors = build_internships(request.user, [item.dict() for item in payload])
+    if errors:
+        return 400, {
+            "created": 0,
+            "results": [{"index": i, "errors": errors.get(i)} for i in range(len(payload))],
+        }
+    created = bulk_create_internships(internships)
+    return 200, {
+        "created": len(created),
+        "results": [{"index": i, "id": job.pk} for i, job in enumerate(created)],
+    }
+
+@api.get("/profile/me/internships", response={200: List[InternshipSchema], 400: MessageSchema, 401: MessageSchema, 403: MessageSchema})
+def get_my_internships(request, response: HttpResponse, cursor: str = None, limit: int = API_PAGE_SIZE):
     if not request.user.profile.is_company:
         return 403, {"message": "Only companies have internships"}
     internships = Internship.objects.filter(owner=request.user)
-    return internships
+    try:
+        return 200, paginate(response, internships, cursor, limit)
+    except InvalidCursor:
+        return 400, {"message": "Invalid cursor"}
 
-@api.get("/internships/{internship_id}/applications", response={200: List[ApplicationSchema], 401: MessageSchema, 403: MessageSchema, 404: MessageSchema})
-def get_internship_applications(request, internship_id: int):
+@api.get("/internships/{internship_id}/applications", response={200: List[ApplicationSchema], 400: MessageSchema, 401: MessageSchema, 403: MessageSchema, 404: MessageSchema})
+def get_internship_applications(request, internship_id: int, response: HttpResponse, cursor: str = None, limit: int = API_PAGE_SIZE):
     if not request.user.profile.is_company:
         return 403, {"message": "Permission denied"}
     internship = get_object_or_404(Internship, id=internship_id)
     if internship.owner != request.user:
         return 403, {"message": "You do not own this internship"}
     apps = Application.objects.filter(internship=internship).select_related('internship', 'student__profile')
-    return apps
+    try:
+        return 200, paginate(response, apps, cursor, limit, ("-submitted_at", "-id"))
+    except InvalidCursor:
+        return 400, {"message": "Invalid cursor"}
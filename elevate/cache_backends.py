@@ -0,0 +1,185 @@
+# elevate/cache_backends.py
+"""
+Cache backends shared by every worker process (see settings/production.py).
+
+- FileBasedCache: a directory on local disk, no extra service needed.
+  Entries are already pickled and zlib-compressed by Django.
+- RedisCache: any Redis-protocol server (Redis, Valkey, KeyDB), with
+  CompressingSerializer so large rendered fragments take less memory
+  and network.
+
+Both count hits and misses. The counts are kept per process and added
+to shared counters in the cache every STATS_FLUSH_EVERY lookups, so
+cache_stats() sees all the workers together. Those additions are
+atomic on both: Redis INCRBY, and a lock file around the file cache's
+read-modify-write.
+"""
+import os
+import pickle
+import tempfile
+import threading
+import zlib
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.files import locks
+from django.core.cache.backends.filebased import FileBasedCache as DjangoFileBasedCache
+from django.core.cache.backends.locmem import LocMemCache as DjangoLocMemCache
+from django.core.cache.backends.redis import RedisCache as DjangoRedisCache, RedisSerializer
+
+STATS_KEY_PREFIX = "cachestats"
+STATS_FLUSH_EVERY = 100
+
+# Values smaller than this aren't worth the CPU to compress.
+COMPRESS_MIN_BYTES = 1024
+_RAW, _ZLIB = b"\x00", b"\x01"
+
+_MISSING = object()
+
+
+class CompressingSerializer(RedisSerializer):
+    """
+    Pickles like Django's RedisSerializer (ints stay plain, so incr()
+    still works on the server) and zlib-compresses large values.
+    A one-byte header says which.
+    """
+    def dumps(self, obj):
+        if type(obj) is int:
+            return obj
+        data = pickle.dumps(obj, self.protocol)
+        if len(data) >= COMPRESS_MIN_BYTES:
+            return _ZLIB + zlib.compress(data)
+        return _RAW + data
+
+    def loads(self, data):
+        try:
+            return int(data)
+        except ValueError:
+            pass
+        header, body = data[:1], data[1:]
+        if header == _ZLIB:
+            body = zlib.decompress(body)
+        return pickle.loads(body)
+
+
+class CacheStatsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self._pending = {"hits": 0, "misses": 0}
+        self._inner = threading.local()
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version=version)
+        self._record(hits=int(value is not _MISSING), misses=int(value is _MISSING))
+        return default if value is _MISSING else value
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        # Some backends implement get_many() with get(); count once.
+        self._inner.active = True
+        try:
+            found = super().get_many(keys, version=version)
+        finally:
+            self._inner.active = False
+        self._record(hits=len(found), misses=len(keys) - len(found))
+        return found
+
+    def _record(self, hits, misses):
+        if getattr(self._inner, "active", False):
+            return
+        with self._stats_lock:
+            self._pending["hits"] += hits
+            self._pending["misses"] += misses
+            due = sum(self._pending.values()) >= STATS_FLUSH_EVERY
+        if due:
+            self.flush_stats()
+
+    def flush_stats(self):
+        with self._stats_lock:
+            pending, self._pending = self._pending, {"hits": 0, "misses": 0}
+        self._inner.active = True
+        try:
+            for name, count in pending.items():
+                if not count:
+                    continue
+                key = f"{STATS_KEY_PREFIX}:{name}"
+                if not self.add(key, count, None):
+                    try:
+                        self.incr(key, count)
+                    except ValueError:  # evicted in between
+                        self.add(key, count, None)
+        finally:
+            self._inner.active = False
+
+    def stats(self):
+        self.flush_stats()
+        self._inner.active = True
+        try:
+            counts = self.get_many([f"{STATS_KEY_PREFIX}:hits", f"{STATS_KEY_PREFIX}:misses"])
+        finally:
+            self._inner.active = False
+        hits = counts.get(f"{STATS_KEY_PREFIX}:hits", 0)
+        misses = counts.get(f"{STATS_KEY_PREFIX}:misses", 0)
+        total = hits + misses
+        return {"hits": hits, "misses": misses, "hit_ratio": hits / total if total else None}
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._pending = {"hits": 0, "misses": 0}
+        self.delete_many([f"{STATS_KEY_PREFIX}:hits", f"{STATS_KEY_PREFIX}:misses"])
+
+
+class FileBasedCache(CacheStatsMixin, DjangoFileBasedCache):
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        """
+        Django's add() is has_key() then set(), so two workers can both
+        "win" it. os.link() refuses to replace an existing file, which
+        makes this safe to use as a lock (see elevate/cache_compute.py).
+        """
+        if self.has_key(key, version):  # also removes an expired file
+            return False
+        self._createdir()
+        self._cull()
+        fd, tmp_path = tempfile.mkstemp(dir=self._dir)
+        try:
+            with open(fd, "wb") as f:
+                self._write_content(f, timeout, value)
+            os.link(tmp_path, self._key_to_file(key, version))
+        except FileExistsError:
+            return False
+        finally:
+            os.remove(tmp_path)
+        return True
+
+    def incr(self, key, delta=1, version=None):
+        """
+        Django's incr() is get() then set(), so two workers adding to
+        the same counter can lose one of the additions. An exclusive
+        lock on a file in the cache directory serializes them.
+        """
+        self._createdir()
+        with open(os.path.join(self._dir, "incr.lock"), "ab") as lock_file:
+            locks.lock(lock_file, locks.LOCK_EX)
+            try:
+                return super().incr(key, delta, version)
+            finally:
+                locks.unlock(lock_file)
+
+
+class RedisCache(CacheStatsMixin, DjangoRedisCache):
+    pass
+
+
+class LocMemCache(CacheStatsMixin, DjangoLocMemCache):
+    # Per process; for development and tests.
+    pass
+
+
+def cache_stats(alias="default"):
+    """
+    {"hits", "misses", "hit_ratio"} across all workers, or None if the
+    cache doesn't keep stats.
+    """
+    cache = caches[alias]
+    return cache.stats() if isinstance(cache, CacheStatsMixin) else None
@@ -0,0 +1,98 @@
+# elevate/cache_compute.py
+"""
+get_or_compute(): a cache read that protects the database from
+stampedes when an expensive entry (facet counts, dashboard aggregates)
+expires and every worker asks for it at once.
+
+- Single flight: only the worker that wins a cache-backed lock
+  (cache.add, with a timeout in case it dies) recomputes. On a cold
+  miss the others wait for its result instead of computing their own.
+- Stale-while-revalidate: an entry is kept for `stale_ttl` past its
+  `ttl`. While someone recomputes it, everyone else gets the stale
+  value straight away.
+- Probabilistic early refresh ("XFetch"): shortly before expiry, a
+  request may recompute early, with a probability that grows as expiry
+  nears and with how long the computation takes. Popular entries are
+  usually refreshed before they ever go stale.
+"""
+import math
+import random
+import time
+import uuid
+
+from django.core.cache import cache
+
+from .cache_tags import tagged_key
+
+LOCK_TIMEOUT = 30
+WAIT_INTERVAL = 0.05
+
+
+def _lock(key, timeout):
+    token = uuid.uuid4().hex
+    return token if cache.add(f"{key}:lock", token, timeout) else None
+
+
+def _unlock(key, token):
+    lock_key = f"{key}:lock"
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+
+def _compute_and_store(key, compute, ttl, stale_ttl):
+    started = time.time()
+    value = compute()
+    now = time.time()
+    # (value, fresh until, seconds the computation took)
+    cache.set(key, (value, now + ttl, now - started), ttl + stale_ttl)
+    return value
+
+
+def _wait_for(key, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        time.sleep(WAIT_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+        if cache.get(f"{key}:lock") is None:
+            break  # the other worker gave up or failed
+    return None
+
+
+def get_or_compute(key, compute, ttl, tags=(), stale_ttl=None, beta=1.0, lock_timeout=LOCK_TIMEOUT):
+    """
+    Returns the cached value for `key`, calling `compute()` when it is
+    missing, stale or due for an early refresh. `tags` (see cache_tags)
+    are folded into the key. `stale_ttl` defaults to `ttl`; `beta` > 1
+    refreshes earlier, 0 turns early refresh off.
+    """
+    key = tagged_key(key, tags)
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, fresh_until, delta = entry
+        # XFetch: -log(U) is exponentially distributed, so the
+        # refresh point is jittered across workers.
+        if time.time() - delta * beta * math.log(1 - random.random()) < fresh_until:
+            return value
+        token = _lock(key, lock_timeout)
+        if token is None:
+            return value  # someone else is refreshing; serve stale
+        try:
+            return _compute_and_store(key, compute, ttl, stale_ttl)
+        finally:
+            _unlock(key, token)
+
+    token = _lock(key, lock_timeout)
+    if token is None:
+        entry = _wait_for(key, lock_timeout)
+        if entry is not None:
+            return entry[0]
+        token = _lock(key, lock_timeout)
+    try:
+        return _compute_and_store(key, compute, ttl, stale_ttl)
+    finally:
+        if token is not None:
+            _unlock(key, token)
@@ -0,0 +1,138 @@
+# elevate/cache_policy.py
+"""
+Per-view response caching.
+
+Each cached view declares a CachePolicy: how long to keep a response,
+what it varies on (who is looking, which query parameters, HTMX or
+not) and the tags that invalidate it. This replaces the site-wide cache
+middleware, which every personalised view had to opt out of.
+
+Only responses that are the same for everyone in the same audience are
+stored. A response is skipped if it used the CSRF token, set a cookie,
+or if the request has flash messages waiting, so logged-in pages
+(which carry the logout form's token) are always rendered fresh.
+
+Tags (elevate/cache_tags.py) are version counters in the cache; the
+key includes the current version of each, so invalidating a tag makes
+every response under it unreachable in one increment.
+"""
+import hashlib
+from functools import wraps
+
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import add_never_cache_headers, patch_vary_headers
+
+from .cache_tags import tagged_key
+
+RESPONSE_PREFIX = "response"
+
+
+def audience(user):
+    if not user.is_authenticated:
+        return "anonymous"
+    profile = getattr(user, "profile", None)
+    return getattr(profile, "role", "") or "user"
+
+
+def _has_pending_messages(request):
+    if not hasattr(request, "_messages"):
+        return False
+    storage = get_messages(request)
+    pending = bool(list(storage))
+    storage.used = False  # looking must not consume them
+    return pending
+
+
+class CachePolicy:
+    """
+    ttl:        seconds a stored response is served.
+    vary:       any of "role" (anonymous / student / company) and "htmx".
+                The path is always part of the key.
+    params:     query parameters in the key; None means all of them.
+    tags:       invalidation tags; "{name}" is filled from the view's
+                URL kwargs, e.g. "internship:{pk}" (see cache_tags.py).
+    audiences:  who gets cached responses; None means everyone.
+    """
+    def __init__(self, name, ttl, vary=("role",), params=None, tags=(), audiences=None):
+        self.name = name
+        self.ttl = ttl
+        self.vary = frozenset(vary)
+        self.params = params
+        self.tags = tags
+        self.audiences = audiences
+
+    def applies_to(self, request):
+        if request.method not in ("GET", "HEAD"):
+            return False
+        if self.audiences is not None and audience(request.user) not in self.audiences:
+            return False
+        return not _has_pending_messages(request)
+
+    def key(self, request, *extra, **kwargs):
+        tags = [tag.format(**kwargs) for tag in self.tags]
+        params = sorted(
+            (name, values) for name, values in request.GET.lists()
+            if self.params is None or name in self.params
+        )
+        parts = [
+            request.get_host(), request.path, params,
+            audience(request.user) if "role" in self.vary else "",
+            request.headers.get("HX-Request") == "true" if "htmx" in self.vary else "",
+            *extra,
+        ]
+        digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+        return tagged_key(f"{RESPONSE_PREFIX}:{self.name}:{digest}", tags)
+
+    def respond(self, request, render, **kwargs):
+        """
+        Returns the stored response for `request`, or calls `render()`
+        and stores what it returns if it is safe to share.
+        """
+        if not self.applies_to(request):
+            response = render()
+            add_never_cache_headers(response)
+            return response
+
+        key = self.key(request, **kwargs)
+        stored = cache.get(key)
+        if stored is not None:
+            status, content, headers = stored
+            response = HttpResponse(content, status=status)
+            for header, value in headers:
+                response[header] = value
+            return response
+
+        response = render()
+        if hasattr(response, "render") and not response.is_rendered:
+            response.add_post_render_callback(lambda r: self.store(request, key, r))
+        else:
+            self.store(request, key, response)
+        self._patch_headers(response)
+        return response
+
+    def store(self, request, key, response):
+        if (
+            response.status_code != 200 or response.streaming or response.cookies
+            or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        ):
+            return
+        self._patch_headers(response)
+        cache.set(key, (response.status_code, response.content, list(response.items())), self.ttl)
+
+    def _patch_headers(self, response):
+        # Cached here, on the server; browsers and proxies revalidate,
+        # so a login or an invalidation is seen on the next request.
+        add_never_cache_headers(response)
+        if "htmx" in self.vary:
+            patch_vary_headers(response, ("HX-Request",))
+
+    def __call__(self, view_func):
+        # A decorator for function views; class-based views use
+        # method_decorator(policy, name="dispatch").
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            return self.respond(request, lambda: view_func(request, *args, **kwargs), **kwargs)
+        return wrapper
+
@@ -0,0 +1,87 @@
+# elevate/cache_tags.py
+"""
+Tag-based cache invalidation.
+
+A tag is a version counter kept in the cache itself. A cached entry
+puts the current versions of the tags it depends on into its key
+(tagged_key), and invalidate_tags() bumps the counters, so every
+dependent key misses on its next read. Nothing is enumerated or
+deleted, and it only needs get_many / add / incr, which LocMem, the
+file and database backends and Redis all provide.
+
+The tags in use, bumped by the model signal handlers in
+internships/, applications/, accounts/ and website/signals.py:
+
+    internships:list   any change to the set of listed internships
+    internship:<id>    one internship, its applicants, its company's profile
+    company:<id>       a company's internships, applications and profile
+    page:<id>          one Wagtail page, on publish / unpublish
+    site:settings      the Wagtail site settings shown on every page
+"""
+import time
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+TAG_VERSION_PREFIX = "cachetag"
+
+INTERNSHIPS_LIST = "internships:list"
+SITE_SETTINGS = "site:settings"
+
+
+def internship_tag(pk):
+    return f"internship:{pk}"
+
+
+def company_tag(user_id):
+    return f"company:{user_id}"
+
+
+def page_tag(pk):
+    return f"page:{pk}"
+
+
+def _version_key(tag):
+    return f"{TAG_VERSION_PREFIX}:{tag}"
+
+
+def tag_versions(tags):
+    keys = [_version_key(tag) for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seeded from the clock, like the listing version, so an
+            # evicted counter never repeats an old value.
+            seed = int(time.time() * 1000)
+            cache.add(key, seed, None)
+            versions[key] = cache.get(key, seed)
+    return [versions[key] for key in keys]
+
+
+def tagged_key(key, tags):
+    """
+    `key` with the current version of each tag appended; changes as
+    soon as any of the tags is invalidated.
+    """
+    if not tags:
+        return key
+    return f"{key}:{'.'.join(str(v) for v in tag_versions(tags))}"
+
+
+def _bump(tags):
+    for tag in tags:
+        try:
+            cache.incr(_version_key(tag))
+        except ValueError:
+            # Never read, or evicted: nothing cached under it can be
+            # reached any more, a fresh seed is enough.
+            tag_versions([tag])
+
+
+def invalidate_tags(*tags):
+    _bump(tags)
+    if connection.in_atomic_block:
+        # Bumped again once the change is visible to other connections:
+        # a reader in between could have cached the old rows under the
+        # first new version.
+        transaction.on_commit(lambda: _bump(tags))
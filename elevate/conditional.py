@@ -0,0 +1,40 @@
+# elevate/conditional.py
+"""
+Conditional GET for API endpoints.
+
+The endpoint works out a cheap validator first (an aggregate, a revision
+id), and if the client already holds that version it gets a bare 304
+before anything is loaded or serialized.
+"""
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def conditional_get(request, response, etag, last_modified=None, private=False):
+    """
+    Stamps `response` (Ninja's temporal response, or any HttpResponse)
+    with ETag / Last-Modified / Cache-Control, then returns a 304 carrying
+    the same headers if the request's If-None-Match or If-Modified-Since
+    already matches, else None.
+
+    max-age=0 makes clients revalidate every time (which is now cheap).
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response["ETag"] = etag
+    if timestamp is not None:
+        response["Last-Modified"] = http_date(timestamp)
+    patch_cache_control(
+        response, max_age=0, must_revalidate=True,
+        **({"private": True} if private else {"public": True}),
+    )
+    conditional = get_conditional_response(
+        request, etag=etag, last_modified=timestamp, response=response,
+    )
+    # Hands `response` back untouched when there is nothing to short-circuit.
+    return None if conditional is response else conditional
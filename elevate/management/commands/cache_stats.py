@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from elevate.cache_backends import cache_stats
+
+
+class Command(BaseCommand):
+    help = "Shows the cache hit/miss counts summed over all worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--alias", default="default")
+        parser.add_argument("--reset", action="store_true", help="Start counting from zero.")
+
+    def handle(self, *args, **options):
+        stats = cache_stats(options["alias"])
+        if stats is None:
+            raise CommandError(f"The '{options['alias']}' cache doesn't keep stats (see elevate/cache_backends.py).")
+        ratio = "n/a" if stats["hit_ratio"] is None else f"{stats['hit_ratio']:.1%}"
+        self.stdout.write(f"Hits: {stats['hits']}  Misses: {stats['misses']}  Hit ratio: {ratio}")
+        if options["reset"]:
+            from django.core.cache import caches
+            caches[options["alias"]].reset_stats()
+            self.stdout.write(self.style.SUCCESS("Counters reset."))
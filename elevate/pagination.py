@@ -0,0 +1,143 @@
+# elevate/pagination.py
+"""
+Keyset ("cursor") pagination.
+
+Django's Paginator needs a COUNT(*) and an OFFSET scan that gets slower
+the deeper you page. Here each page is fetched with a WHERE clause on
+the ordering columns of the last row seen, so page 500 costs the same
+as page 1. Cursors are signed, opaque tokens.
+"""
+from django.core import signing
+from django.db.models import Q
+
+CURSOR_SALT = "elevate.pagination.cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode_value(value):
+    # Datetimes go over the wire as ISO strings; the ORM parses
+    # them back when they are used in a lookup.
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+class CursorPage:
+    """
+    One page of results. Quacks enough like django.core.paginator.Page
+    for the templates (object_list, has_next, has_previous, ...).
+    """
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    Paginates `queryset` by `ordering`, e.g. ("-posted_at", "-id").
+    The last field must be unique so every row has a distinct position.
+    """
+    def __init__(self, queryset, per_page, ordering=("-posted_at", "-id")):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = tuple(ordering)
+        self.fields = [f.lstrip("-") for f in self.ordering]
+
+    def encode_cursor(self, obj, backwards=False):
+        values = [_encode_value(getattr(obj, f)) for f in self.fields]
+        return signing.dumps(
+            {"o": list(self.ordering), "v": values, "b": backwards},
+            salt=CURSOR_SALT, compress=True,
+        )
+
+    def decode_cursor(self, cursor):
+        try:
+            data = signing.loads(cursor, salt=CURSOR_SALT)
+            ordering, values, backwards = data["o"], data["v"], bool(data["b"])
+        except (signing.BadSignature, KeyError, TypeError) as e:
+            raise InvalidCursor("Invalid cursor") from e
+        # A cursor from a differently sorted listing points nowhere here.
+        if ordering != list(self.ordering) or len(values) != len(self.fields):
+            raise InvalidCursor("Invalid cursor")
+        return values, backwards
+
+    def _seek(self, values, backwards):
+        """
+        Builds the "comes after (or before) this row" condition:
+        (a < x) OR (a = x AND b < y) OR ...
+        """
+        condition = Q()
+        for i, order in enumerate(self.ordering):
+            descending = order.startswith("-")
+            if backwards:
+                descending = not descending
+            lookup = "lt" if descending else "gt"
+            term = Q(**{f"{self.fields[i]}__{lookup}": values[i]})
+            for field, value in zip(self.fields[:i], values[:i]):
+                term &= Q(**{field: value})
+            condition |= term
+        return condition
+
+    def page(self, cursor=None):
+        values, backwards = (None, False)
+        if cursor:
+            values, backwards = self.decode_cursor(cursor)
+
+        qs = self.queryset
+        ordering = self.ordering
+        if backwards:
+            ordering = tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+        if values is not None:
+            qs = qs.filter(self._seek(values, backwards))
+
+        # One extra row tells us whether there is anything beyond this page.
+        rows = list(qs.order_by(*ordering)[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or backwards:
+                next_cursor = self.encode_cursor(rows[-1])
+            if (has_more and backwards) or (values is not None and not backwards):
+                previous_cursor = self.encode_cursor(rows[0], backwards=True)
+        return CursorPage(rows, next_cursor, previous_cursor)
+
+
+class CursorPaginationMixin:
+    """
+    Drop-in replacement for ListView's offset pagination.
+    Reads the `cursor` query parameter; a missing or tampered
+    cursor just shows the first page.
+    """
+    cursor_ordering = ("-posted_at", "-id")
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = CursorPaginator(queryset, page_size, self.get_cursor_ordering())
+        try:
+            page = paginator.page(self.request.GET.get("cursor"))
+        except InvalidCursor:
+            page = paginator.page()
+        return (paginator, page, page.object_list, page.has_other_pages())
@@ -62,17 +62,20 @@ INSTALLED_APPS = [
     "applications",
     "students",
     "companies",
+    # Project-wide code (caching, storage, uploads); installed for its
+    # management commands.
+    "elevate",
 
     "storages",
     'django_htmx',
     'rest_framework',
     'ninja',
+    'django_tasks',
+    'django_tasks.backends.database',
 
 ]
 
 MIDDLEWARE = [
-    'django.middleware.cache.UpdateCacheMiddleware',
-
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -82,8 +85,6 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "wagtail.contrib.redirects.middleware.RedirectMiddleware",
     'django_htmx.middleware.HtmxMiddleware',
-
-    'django.middleware.cache.FetchFromCacheMiddleware',
 ]
 
 ROOT_URLCONF = "elevate.urls"
@@ -217,6 +218,13 @@ WAGTAILDOCS_EXTENSIONS = ['csv', 'docx', 'key', 'odt', 'pdf', 'pptx', 'rtf', 'tx
 
 
 # Authentication settings
+# ProfileModelBackend loads request.user with its profile in one query
+# (accounts/backends.py). ModelBackend stays listed so sessions that
+# were stored under it, before the switch, are still accepted.
+AUTHENTICATION_BACKENDS = [
+    "accounts.backends.ProfileModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
 LOGIN_URL = "/accounts/login/"
 LOGOUT_REDIRECT_URL = "/accounts/login/"
 
@@ -225,8 +233,27 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 DEFAULT_FROM_EMAIL = 'webmaster@localhost' 
 
 
-# Cache timeout (in seconds). 60 seconds * 15 minutes = 900
-CACHE_MIDDLEWARE_SECONDS = 900
+# Size / file-type checks on uploads as they stream in (elevate/uploads.py),
+# ahead of Django's usual memory / temp-file handlers, which also hash
+# the bytes for the content-addressed storage.
+FILE_UPLOAD_HANDLERS = [
+    "elevate.uploads.SniffingUploadHandler",
+    "elevate.uploads.HashingMemoryFileUploadHandler",
+    "elevate.uploads.HashingTemporaryFileUploadHandler",
+]
+
+
+# Background tasks (django-tasks). Queued in the database and run by
+# `python manage.py db_worker`, outside the web workers.
+TASKS = {
+    "default": {
+        "BACKEND": "django_tasks.backends.database.DatabaseBackend",
+    },
+}
+
+# Finished exports are deleted after this many days
+# (`python manage.py delete_old_exports`, run daily).
+EXPORT_RETENTION_DAYS = 7
 
 
 #---------- MinIO / S3 Storage Settings ----------
@@ -269,6 +296,22 @@ STORAGES = {
         },
     },
 
+    # Applicant exports: never public, only served through the
+    # owner's download view (elevate.storage.private_storage).
+    "private": {
+        "BACKEND": "storages.backends.s3boto3.S3Boto3Storage",
+        "OPTIONS": {
+            "endpoint_url": AWS_S3_ENDPOINT_URL,
+            "access_key": AWS_ACCESS_KEY_ID,
+            "secret_key": AWS_SECRET_ACCESS_KEY,
+            "bucket_name": BUCKET_NAME,
+            "location": "private",
+            "default_acl": "private",
+            "querystring_auth": True,
+            "object_parameters": {"CacheControl": "private, no-store"},
+        },
+    },
+
     "staticfiles": {
         "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
     },
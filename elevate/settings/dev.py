@@ -16,8 +16,9 @@ EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 # (This is DIFFERENT from production)
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'BACKEND': 'elevate.cache_backends.LocMemCache',
         'LOCATION': 'elevate-development-cache',
+        'KEY_PREFIX': 'elevate-dev',
     }
 }
 
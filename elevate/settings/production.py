@@ -1,3 +1,5 @@
+from django.core.exceptions import ImproperlyConfigured
+
 from .base import *
 
 DEBUG = False
@@ -8,6 +10,36 @@ DEBUG = False
 # See https://docs.djangoproject.com/en/5.2/ref/contrib/staticfiles/#manifeststaticfilesstorage
 STORAGES["staticfiles"]["BACKEND"] = "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
 
+# --- Caching Settings ---
+# One cache shared by every gunicorn worker, so whatever one worker
+# computes is a hit for all of them (elevate/cache_backends.py).
+# Redis, or any Redis-protocol server, when REDIS_URL is set (needs the
+# `redis` package); otherwise a directory on local disk.
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "elevate-production")
+
+if os.getenv("REDIS_URL"):
+    try:
+        import redis  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured("REDIS_URL is set but the `redis` package isn't installed (pip install redis).")
+    CACHES = {
+        "default": {
+            "BACKEND": "elevate.cache_backends.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+            "OPTIONS": {"serializer": "elevate.cache_backends.CompressingSerializer"},
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "elevate.cache_backends.FileBasedCache",
+            "LOCATION": os.getenv("CACHE_DIR", os.path.join(BASE_DIR, "cache")),
+            "KEY_PREFIX": CACHE_KEY_PREFIX,
+            "OPTIONS": {"MAX_ENTRIES": 20000},
+        }
+    }
+
 try:
     from .local import *
 except ImportError:
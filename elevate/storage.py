@@ -0,0 +1,228 @@
+# elevate/storage.py
+"""
+Content-addressed file storage, and the private storage for exports.
+
+Files are stored under the SHA-256 of their bytes, so a CV uploaded to
+the profile and then to ten applications is one object in the bucket,
+and re-uploading it costs a hash and an exists() check instead of a PUT.
+Everything else (open, url, size, ...) goes to the default storage.
+"""
+import hashlib
+import os
+
+from django.conf import settings
+from django.core.files.storage import Storage, default_storage, storages
+from django.utils.deconstruct import deconstructible
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def is_s3_storage(storage):
+    # django-storages' S3Storage (also used for MinIO).
+    return hasattr(storage, "bucket_name") and hasattr(storage, "connection")
+
+
+def file_chunks(storage, name, chunk_size=HASH_CHUNK_SIZE):
+    """
+    Yields a stored file's bytes in chunk_size pieces. On S3 that is the
+    GET response body itself; S3File would spool the whole object to a
+    temp file on its first read().
+    """
+    if is_s3_storage(storage):
+        body = storage.connection.meta.client.get_object(
+            Bucket=storage.bucket_name, Key=storage._normalize_name(name),
+        )["Body"]
+        try:
+            yield from body.iter_chunks(chunk_size)
+        finally:
+            body.close()
+        return
+    with storage.open(name, "rb") as source:
+        while chunk := source.read(chunk_size):
+            yield chunk
+
+
+def content_hash(content):
+    """
+    SHA-256 of an uploaded file. Uses the `sha256` attribute that the
+    upload handlers (elevate/uploads.py) set while the file streamed in,
+    so a form upload is not read a second time.
+    """
+    digest = getattr(content, "sha256", None)
+    if digest:
+        return digest
+    sha = hashlib.sha256()
+    for chunk in content.chunks(HASH_CHUNK_SIZE):
+        sha.update(chunk)
+    content.seek(0)
+    return sha.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(Storage):
+    prefix = "blobs"
+
+    def __init__(self, storage=None):
+        self._storage = storage
+
+    @property
+    def storage(self):
+        return self._storage or default_storage
+
+    def blob_name(self, digest, extension):
+        return f"{self.prefix}/{digest[:2]}/{digest}{extension.lower()}"
+
+    def save(self, name, content, max_length=None):
+        # `name` (from upload_to) only contributes its extension.
+        name = self.blob_name(content_hash(content), os.path.splitext(name)[1])
+        if not self.storage.exists(name):
+            name = self.storage.save(name, content, max_length=max_length)
+        return name
+
+    def adopt(self, name):
+        """
+        Moves a file written straight to the underlying storage (a
+        presigned upload) under its content hash; returns the blob name.
+        If the blob already exists the upload is simply dropped.
+        """
+        sha = hashlib.sha256()
+        for chunk in file_chunks(self.storage, name):
+            sha.update(chunk)
+        blob = self.blob_name(sha.hexdigest(), os.path.splitext(name)[1])
+        if not self.storage.exists(blob):
+            if is_s3_storage(self.storage):
+                # Server-side copy: the bytes don't pass through us again.
+                acl = getattr(self.storage, "default_acl", None)
+                self.storage.connection.meta.client.copy_object(
+                    Bucket=self.storage.bucket_name, Key=self.storage._normalize_name(blob),
+                    CopySource={"Bucket": self.storage.bucket_name, "Key": self.storage._normalize_name(name)},
+                    **({"ACL": acl} if acl else {}),
+                )
+            else:
+                with self.storage.open(name) as f:
+                    self.storage.save(blob, f)
+        self.storage.delete(name)
+        return blob
+
+    def delete(self, name):
+        # Blobs are shared by every row that uploaded the same bytes,
+        # so one row letting go of its file must not remove it. Blobs
+        # no row points at any more are removed by
+        # `python manage.py delete_unreferenced_blobs`.
+        pass
+
+    def open(self, name, mode="rb"):
+        return self.storage.open(name, mode)
+
+    def exists(self, name):
+        return self.storage.exists(name)
+
+    def size(self, name):
+        return self.storage.size(name)
+
+    def url(self, name):
+        return self.storage.url(name)
+
+    def path(self, name):
+        return self.storage.path(name)
+
+    def listdir(self, path):
+        return self.storage.listdir(path)
+
+    def get_modified_time(self, name):
+        return self.storage.get_modified_time(name)
+
+
+def content_addressed_storage():
+    # A callable, so migrations don't capture the storage instance.
+    return ContentAddressedStorage()
+
+
+def blob_fields():
+    """
+    (model, field name) for every FileField kept in a
+    ContentAddressedStorage.
+    """
+    from django.apps import apps
+    from django.db.models import FileField
+
+    return [
+        (model, field.name)
+        for model in apps.get_models()
+        for field in model._meta.get_fields()
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def is_referenced(name):
+    return any(model._default_manager.filter(**{field: name}).exists() for model, field in blob_fields())
+
+
+def unreferenced_blobs(modified_before):
+    """
+    Yields the names of blobs no row points at, last written before
+    `modified_before` (so uploads still being saved are left alone).
+    """
+    storage = ContentAddressedStorage()
+    referenced = set()
+    for model, field in blob_fields():
+        referenced.update(
+            model._default_manager.filter(**{f"{field}__startswith": f"{storage.prefix}/"})
+            .values_list(field, flat=True).distinct()
+        )
+    try:
+        directories = storage.listdir(storage.prefix)[0]
+    except FileNotFoundError:  # nothing uploaded yet
+        return
+    for directory in directories:
+        for filename in storage.listdir(f"{storage.prefix}/{directory}")[1]:
+            name = f"{storage.prefix}/{directory}/{filename}"
+            if name not in referenced and storage.get_modified_time(name) < modified_before:
+                yield name
+
+
+@deconstructible
+class PrivateStorage(Storage):
+    """
+    Files that must never have a public URL (exports of applicant data).
+    Goes to the "private" entry of STORAGES, looked up on every call so
+    settings overrides apply; without one, to the default storage.
+    """
+    alias = "private"
+
+    @property
+    def storage(self):
+        if self.alias in settings.STORAGES:
+            return storages[self.alias]
+        return default_storage
+
+    def save(self, name, content, max_length=None):
+        return self.storage.save(name, content, max_length=max_length)
+
+    def delete(self, name):
+        self.storage.delete(name)
+
+    def open(self, name, mode="rb"):
+        return self.storage.open(name, mode)
+
+    def exists(self, name):
+        return self.storage.exists(name)
+
+    def size(self, name):
+        return self.storage.size(name)
+
+    def url(self, name):
+        return self.storage.url(name)
+
+    def path(self, name):
+        return self.storage.path(name)
+
+    def listdir(self, path):
+        return self.storage.listdir(path)
+
+    def get_modified_time(self, name):
+        return self.storage.get_modified_time(name)
+
+
+def private_storage():
+    return PrivateStorage()
@@ -0,0 +1,128 @@
+# elevate/tests.py
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from .cache_backends import CompressingSerializer, FileBasedCache
+
+
+@pytest.fixture
+def shared_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def worker_cache(location):
+    # What each gunicorn worker builds from the production CACHES setting.
+    return FileBasedCache(location, {"KEY_PREFIX": "elevate-test"})
+
+
+def test_file_cache_is_shared_between_workers_and_counts_hits(shared_dir):
+    one, two = worker_cache(shared_dir), worker_cache(shared_dir)
+
+    one.set("facets", {"titles": {"Data Intern": 1}})
+    assert two.get("facets") == {"titles": {"Data Intern": 1}}
+    assert two.get("missing") is None
+
+    # add() is atomic across workers, so it works as a lock.
+    assert one.add("facets:lock", "a", 30)
+    assert not two.add("facets:lock", "b", 30)
+    assert two.get("facets:lock") == "a"
+
+    one.get_many(["facets", "missing"])
+    two.flush_stats()
+    assert one.stats() == {"hits": 3, "misses": 2, "hit_ratio": 0.6}
+
+
+def test_file_cache_incr_loses_no_updates(shared_dir):
+    from concurrent.futures import ThreadPoolExecutor
+
+    worker_cache(shared_dir).add("cachestats:hits", 0, None)
+
+    def flush(_):
+        cache = worker_cache(shared_dir)
+        for _ in range(25):
+            cache.incr("cachestats:hits", 2)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(flush, range(8)))
+    assert worker_cache(shared_dir).get("cachestats:hits") == 400
+
+
+def test_compressing_serializer():
+    serializer = CompressingSerializer()
+    fragment = "<li>Data Intern</li>" * 500
+
+    data = serializer.dumps(fragment)
+    assert len(data) < len(fragment) / 10
+    assert serializer.loads(data) == fragment
+    assert serializer.loads(serializer.dumps({"a": 1})) == {"a": 1}
+    # Plain ints, so the server can incr() them.
+    assert serializer.dumps(7) == 7
+    assert serializer.loads(b"7") == 7
+
+
+def test_cache_stats_command(settings, shared_dir):
+    settings.CACHES = {"default": {
+        "BACKEND": "elevate.cache_backends.FileBasedCache",
+        "LOCATION": shared_dir,
+        "KEY_PREFIX": "elevate-test",
+    }}
+    from django.core.cache import cache
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+
+    out = StringIO()
+    call_command("cache_stats", "--reset", stdout=out)
+    assert "Hits: 1  Misses: 1  Hit ratio: 50.0%" in out.getvalue()
+    assert cache.stats()["hits"] == 0
+
+
+@pytest.fixture
+def tag_cache(settings):
+    # A private in-memory cache, so tag versions start from scratch.
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tags"}}
+    from django.core.cache import cache
+    cache.clear()
+    return cache
+
+
+def test_get_or_compute_recomputes_once_per_expiry(tag_cache, monkeypatch):
+    """
+    Eight workers asking at once: one computes, the others wait for it
+    (cold) or get the stale value while it refreshes (expired).
+    """
+    import threading
+    import time
+    from . import cache_compute
+
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return len(calls)
+
+    def hammer(workers=8):
+        barrier, results = threading.Barrier(workers), []
+
+        def worker():
+            barrier.wait()
+            results.append(cache_compute.get_or_compute("stats", compute, ttl=60, beta=0))
+
+        threads = [threading.Thread(target=worker) for _ in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return sorted(results)
+
+    assert hammer() == [1] * 8
+    assert len(calls) == 1
+
+    real_time = time.time
+    monkeypatch.setattr(cache_compute.time, "time", lambda: real_time() + 61)
+    assert hammer() == [1] * 7 + [2]
+    assert len(calls) == 2
+    assert cache_compute.get_or_compute("stats", compute, ttl=60, beta=0) == 2
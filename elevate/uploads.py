@@ -0,0 +1,152 @@
+# elevate/uploads.py
+"""
+Upload checks that run while the request body is still streaming in.
+
+SniffingUploadHandler sits first in FILE_UPLOAD_HANDLERS. For the views
+listed in UPLOAD_RULES it counts the bytes of each file field and looks
+at the first few KB with `filetype` (magic bytes, not the extension).
+As soon as a file is too large or of the wrong type it stops the upload,
+so the rest of the body is never read or spooled to temp disk. The
+reason is left in request.upload_errors for the view to report.
+
+The memory / temp-file handlers after it are Django's, plus a SHA-256
+of the bytes as they pass, set on the uploaded file as `sha256`; the
+content-addressed storage (elevate/storage.py) then needn't read the
+file again to name it.
+"""
+import hashlib
+from typing import NamedTuple
+
+import filetype
+from django.core.files.uploadhandler import (
+    FileUploadHandler, MemoryFileUploadHandler, StopUpload, TemporaryFileUploadHandler,
+)
+
+MB = 1024 * 1024
+
+# filetype reads at most this much of a file to identify it.
+SNIFF_BYTES = 8192
+
+
+class UploadRule(NamedTuple):
+    max_size: int
+    types: frozenset  # filetype extensions
+
+    def describe_types(self):
+        return "/".join(sorted(t.upper() for t in self.types))
+
+
+DOCUMENT_TYPES = frozenset({"pdf", "doc", "docx"})
+IMAGE_TYPES = frozenset({"jpg", "png", "gif", "webp"})
+
+CV_RULE = UploadRule(5 * MB, DOCUMENT_TYPES)
+COVER_LETTER_RULE = UploadRule(2 * MB, DOCUMENT_TYPES)
+AVATAR_RULE = UploadRule(5 * MB, IMAGE_TYPES)
+
+# URL name -> {file field: rule}. Ninja endpoints are named after their function.
+UPLOAD_RULES = {
+    "student_apply": {"cv": CV_RULE, "cover_letter": COVER_LETTER_RULE},
+    "apply_for_internship": {"cv": CV_RULE, "cover_letter": COVER_LETTER_RULE},
+    "account_profile_edit": {"cv": CV_RULE, "cover_letter": COVER_LETTER_RULE, "avatar": AVATAR_RULE},
+    # The signed policy carries the exact limit; this is the largest one.
+    "direct_upload": {"file": CV_RULE},
+}
+
+
+def _sniffed_type(head, file_name):
+    kind = filetype.guess(head)
+    extension = kind.extension if kind else None
+    # A .docx is a ZIP; filetype only says "docx" when the Word part
+    # happens to come first in the archive.
+    if extension == "zip" and file_name.lower().endswith(".docx"):
+        extension = "docx"
+    return extension
+
+
+class SniffingUploadHandler(FileUploadHandler):
+    def __init__(self, request=None):
+        super().__init__(request)
+        match = getattr(request, "resolver_match", None)
+        self.rules = UPLOAD_RULES.get(match.url_name, {}) if match else {}
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.rule = self.rules.get(field_name)
+        self.received = 0
+        self.head = b""
+        self.sniffed = False
+
+    def receive_data_chunk(self, raw_data, start):
+        if self.rule is not None:
+            self.received += len(raw_data)
+            if self.received > self.rule.max_size:
+                self.reject(f"File must be ≤ {self.rule.max_size // MB} MB.")
+            if not self.sniffed:
+                self.head += raw_data[:SNIFF_BYTES - len(self.head)]
+                if len(self.head) >= SNIFF_BYTES:
+                    self.sniff()
+        # Pass the bytes on to the handler that actually stores them.
+        return raw_data
+
+    def file_complete(self, file_size):
+        if self.rule is not None and self.received and not self.sniffed:
+            self.sniff()  # smaller than SNIFF_BYTES
+        return None
+
+    def sniff(self):
+        self.sniffed = True
+        if _sniffed_type(self.head, self.file_name) not in self.rule.types:
+            self.reject(f"Only {self.rule.describe_types()} files are allowed.")
+
+    def reject(self, message):
+        self.request.upload_errors = {**getattr(self.request, "upload_errors", {}), self.field_name: message}
+        # connection_reset: don't read (or store) the rest of the body.
+        raise StopUpload(connection_reset=True)
+
+
+class HashingMixin:
+    def new_file(self, *args, **kwargs):
+        # Before super(): the memory handler ends new_file() by raising
+        # StopFutureHandlers when it takes the file.
+        self.sha256 = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        # The memory handler passes files too big for it on unread.
+        if getattr(self, "activated", True):
+            self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        if uploaded is not None:
+            uploaded.sha256 = self.sha256.hexdigest()
+        return uploaded
+
+
+class HashingMemoryFileUploadHandler(HashingMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingMixin, TemporaryFileUploadHandler):
+    pass
+
+
+class UploadErrorsMixin:
+    """
+    For forms: reports what SniffingUploadHandler rejected as errors
+    on the fields themselves (instead of "This field is required.").
+    Pass upload_errors=request.upload_errors.
+    """
+    def __init__(self, *args, upload_errors=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.upload_errors = upload_errors or {}
+
+    def full_clean(self):
+        super().full_clean()
+        if not self.is_bound:
+            return
+        for field, message in self.upload_errors.items():
+            if field in self.fields:
+                self._errors[field] = self.error_class([message])
+                self.cleaned_data.pop(field, None)
@@ -8,6 +8,7 @@ from wagtail.admin import urls as wagtailadmin_urls
 from wagtail.documents import urls as wagtaildocs_urls
 from django.conf.urls.static import static
 from search import views as search_views
+from applications.views import DirectUploadView
 
 from .api import api_router, api as ninja_api
 
@@ -27,6 +28,9 @@ urlpatterns = [
 
     path("api/ninja/", ninja_api.urls), # NINJA API
 
+    # Local stand-in for S3 presigned POST uploads (applications/uploads.py)
+    path("uploads/", DirectUploadView.as_view(), name="direct_upload"),
+
     re_path(r'^', include(wagtail_urls)),
 ]
 
@@ -6,3 +6,4 @@ class InternshipsConfig(AppConfig):
 
     def ready(self):
         import internships.wagtail_hooks  # Ensure wagtail_hooks.py is loaded
+        import internships.signals
@@ -0,0 +1,101 @@
+# internships/autocomplete.py
+"""
+In-process typeahead index for the browse filters.
+
+Each field (titles, locations, companies) is a sorted array searched
+with bisect, so a keystroke costs a binary search plus k steps, with
+no database round-trip. The index is built from the cached browse
+facets and then kept current incrementally from Internship signals.
+
+Every worker process has its own copy. Signals only reach the process
+that made the change, so each index remembers the listing version it
+reflects; if another process has bumped it, the next lookup rebuilds.
+"""
+import bisect
+import threading
+
+from .cache import get_listing_version
+from .facets import get_browse_facets
+
+FIELDS = ("titles", "locations", "companies")
+
+
+class PrefixIndex:
+    """
+    A sorted array of (lowercased, original) values, reference-counted
+    because many internships share a title, location or company.
+    """
+    def __init__(self, counts=None):
+        self._counts = dict(counts or {})
+        self._keys = sorted((v.lower(), v) for v in self._counts)
+
+    def add(self, value):
+        if not value:
+            return
+        n = self._counts.get(value, 0)
+        self._counts[value] = n + 1
+        if n == 0:
+            bisect.insort(self._keys, (value.lower(), value))
+
+    def discard(self, value):
+        n = self._counts.get(value, 0)
+        if n > 1:
+            self._counts[value] = n - 1
+        elif n == 1:
+            del self._counts[value]
+            i = bisect.bisect_left(self._keys, (value.lower(), value))
+            del self._keys[i]
+
+    def search(self, prefix, limit):
+        prefix = prefix.lower()
+        i = bisect.bisect_left(self._keys, (prefix,))
+        matches = []
+        while i < len(self._keys) and len(matches) < limit:
+            key, value = self._keys[i]
+            if not key.startswith(prefix):
+                break
+            matches.append(value)
+            i += 1
+        return matches
+
+
+class AutocompleteIndex:
+    def __init__(self):
+        self.version = None
+        self.fields = {}
+        self._lock = threading.Lock()
+
+    def _ensure_current(self):
+        version = get_listing_version()
+        if version != self.version:
+            with self._lock:
+                if version != self.version:
+                    facets = get_browse_facets()
+                    self.fields = {f: PrefixIndex(facets[f]) for f in FIELDS}
+                    self.version = version
+
+    def search(self, prefix, fields=FIELDS, limit=8):
+        self._ensure_current()
+        return {f: self.fields[f].search(prefix, limit) for f in fields}
+
+    def apply_change(self, old, new, version):
+        """
+        Moves one internship's values from `old` to `new` (each a
+        {field: value} dict, or None when it wasn't / isn't listed).
+        `version` is the listing version this change bumped to; if our
+        copy wasn't at the version just before it, we missed another
+        change and simply rebuild on the next lookup instead.
+        """
+        with self._lock:
+            if self.version is None or version is None or self.version != version - 1:
+                self.version = None
+                return
+            for field in FIELDS:
+                if old:
+                    self.fields[field].discard(old[field])
+                if new:
+                    self.fields[field].add(new[field])
+            self.version = version
+
+
+index = AutocompleteIndex()
@@ -0,0 +1,54 @@
+# internships/bulk.py
+"""
+Batched internship creation, for the bulk API endpoint and the
+import_internships command.
+
+bulk_create() skips save() and the post_save signal, so the search
+index and the listing caches that internships/signals.py normally keeps
+up to date are refreshed here, once per batch instead of once per row.
+"""
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from elevate.cache_tags import INTERNSHIPS_LIST, company_tag, invalidate_tags
+
+from .cache import bump_listing_version
+from .facets import invalidate_browse_facets
+from .models import Internship
+from .search import index_internships
+
+BULK_BATCH_SIZE = 500
+
+
+def build_internships(owner, rows):
+    """
+    Turns dicts of Internship fields into unsaved, validated instances.
+    Returns (internships, errors) where errors maps a row's position
+    to its message dict; a row is in exactly one of the two.
+    """
+    internships, errors = [], {}
+    for i, row in enumerate(rows):
+        internship = Internship(owner=owner, **row)
+        try:
+            internship.full_clean(exclude=["owner"], validate_unique=False)
+        except ValidationError as e:
+            errors[i] = e.message_dict
+        else:
+            internships.append(internship)
+    return internships, errors
+
+
+def bulk_create_internships(internships, batch_size=BULK_BATCH_SIZE):
+    """
+    Inserts `internships` in one transaction, `batch_size` rows per
+    INSERT, and returns them with their primary keys set.
+    """
+    with transaction.atomic():
+        created = Internship.objects.bulk_create(internships, batch_size=batch_size)
+        index_internships(created)
+    if created:
+        invalidate_browse_facets()
+        invalidate_tags(INTERNSHIPS_LIST, *{company_tag(i.owner_id) for i in created})
+        # The autocomplete index notices the new version and rebuilds.
+        bump_listing_version()
+    return created
@@ -0,0 +1,34 @@
+# internships/cache.py
+import time
+
+from django.core.cache import cache
+
+LISTING_VERSION_KEY = "internships:listing_version"
+
+
+def get_listing_version():
+    """
+    A counter that changes whenever any internship changes.
+    Cached listings put it in their key, so one bump makes every
+    previously cached page unreachable without deleting them one by one.
+    """
+    version = cache.get(LISTING_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so an evicted counter never comes
+        # back with a value that old cache keys already used.
+        version = int(time.time() * 1000)
+        if not cache.add(LISTING_VERSION_KEY, version, None):
+            version = cache.get(LISTING_VERSION_KEY, version)
+    return version
+
+
+def bump_listing_version():
+    """
+    Returns the new version, or None if the counter had to be
+    re-seeded (so callers can't tell which version came before).
+    """
+    try:
+        return cache.incr(LISTING_VERSION_KEY)
+    except ValueError:
+        get_listing_version()
+        return None
@@ -0,0 +1,91 @@
+# internships/facets.py
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from elevate.cache_compute import get_or_compute
+from .cache import get_listing_version
+from .models import Internship
+
+BROWSE_FACETS_KEY = "internships:browse_facets"
+
+# The entry is dropped by internships/signals.py whenever an internship
+# changes; the timeout only bounds staleness from edits that don't go
+# through Internship.save() (e.g. a company renaming its user).
+BROWSE_FACETS_TIMEOUT = 60 * 60
+
+# Per-filter counts are keyed on the listing version instead,
+# so they only need a timeout to bound how much piles up.
+FACET_COUNTS_TIMEOUT = 60 * 10
+
+
+def _value_counts(qs, field):
+    return dict(
+        qs.order_by().values_list(field).annotate(n=Count('id')).values_list(field, 'n')
+    )
+
+
+def compute_browse_facets():
+    """
+    {value: number of active internships} for each browse filter.
+    """
+    active = Internship.objects.filter(is_active=True)
+    return {
+        "titles": _value_counts(active, 'title'),
+        "locations": _value_counts(active.exclude(location__exact=''), 'location'),
+        "companies": _value_counts(active, 'owner__username'),
+    }
+
+
+def get_browse_facets():
+    """
+    Returns the title / location / company value counts,
+    computing them at most once per change (and once across workers).
+    """
+    return get_or_compute(BROWSE_FACETS_KEY, compute_browse_facets, BROWSE_FACETS_TIMEOUT)
+
+
+def invalidate_browse_facets():
+    cache.delete(BROWSE_FACETS_KEY)
+
+
+def _by_count(counter):
+    return dict(sorted(counter.items(), key=lambda item: (-item[1], item[0])))
+
+
+def compute_facet_counts(qs):
+    """
+    Counts per location, company and remote/on-site for the internships
+    in `qs`, in one grouped query: one row per distinct
+    (location, company, is_remote) combination, folded up in Python.
+    """
+    locations, companies, remote = Counter(), Counter(), Counter()
+    rows = (
+        qs.order_by()
+        .values_list('location', 'owner__username', 'is_remote')
+        .annotate(n=Count('id'))
+    )
+    for location, company, is_remote, n in rows:
+        if location:
+            locations[location] += n
+        companies[company] += n
+        remote["1" if is_remote else "0"] += n
+    return {
+        "locations": _by_count(locations),
+        "companies": _by_count(companies),
+        # Keyed like the remote_filter parameter.
+        "remote": {"1": remote["1"], "0": remote["0"]},
+    }
+
+
+def get_facet_counts(filters):
+    """
+    Facet counts for the active internships matching `filters`
+    (an internships.filters.BrowseFilters), cached per filter set.
+    """
+    return get_or_compute(
+        f"internships:facet_counts:{get_listing_version()}:{filters.digest()}",
+        lambda: compute_facet_counts(filters.apply(Internship.objects.filter(is_active=True))),
+        FACET_COUNTS_TIMEOUT,
+    )
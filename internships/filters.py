@@ -0,0 +1,52 @@
+# internships/filters.py
+"""
+The browse filters (q, loc, comp, remote_filter), shared by the
+student browse page, its caches and the Ninja API.
+"""
+import hashlib
+from typing import NamedTuple
+
+from .search import search_internships
+
+
+def _text(value):
+    # "  Data   Intern " and "data intern" filter identically
+    # (all lookups are case-insensitive), so they share cache entries.
+    return " ".join((value or "").split()).lower()
+
+
+class BrowseFilters(NamedTuple):
+    q: str = ""
+    loc: str = ""
+    comp: str = ""
+    remote_filter: str = ""
+
+    @classmethod
+    def from_params(cls, params):
+        remote_filter = params.get("remote_filter") or ""
+        return cls(
+            q=_text(params.get("q")),
+            loc=_text(params.get("loc")),
+            comp=_text(params.get("comp")),
+            remote_filter=remote_filter if remote_filter in ("0", "1") else "",
+        )
+
+    def apply(self, qs):
+        if self.q:
+            qs = search_internships(qs, self.q)
+        if self.loc:
+            qs = qs.filter(location__icontains=self.loc)
+        if self.comp:
+            qs = qs.filter(owner__username__icontains=self.comp)
+        if self.remote_filter == "1":
+            qs = qs.filter(is_remote=True)
+        elif self.remote_filter == "0":
+            qs = qs.filter(is_remote=False)
+        return qs
+
+    def digest(self, *extra):
+        """
+        A short stable id for these filters (plus any extra key parts),
+        for use in cache keys.
+        """
+        return hashlib.sha1(repr((tuple(self), *extra)).encode()).hexdigest()
@@ -0,0 +1,97 @@
+import csv
+import os
+from datetime import datetime
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from internships.bulk import BULK_BATCH_SIZE, build_internships, bulk_create_internships
+
+IMPORT_COLUMNS = ("title", "location", "is_remote", "description", "requirements", "deadline")
+TEXT_COLUMNS = ("title", "location", "description", "requirements")
+TRUTHY = {"1", "true", "yes", "y", "t", "remote"}
+
+
+def _csv_rows(path):
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.reader(f)
+
+
+def _xlsx_rows(path):
+    from openpyxl import load_workbook
+
+    # read_only streams rows from the sheet XML instead of
+    # building the whole workbook in memory.
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _clean(row):
+    for column in TEXT_COLUMNS:
+        if column in row:
+            row[column] = "" if row[column] is None else str(row[column]).strip()
+    if "is_remote" in row:
+        value = row["is_remote"]
+        row["is_remote"] = value if isinstance(value, bool) else str(value or "").strip().lower() in TRUTHY
+    if isinstance(row.get("deadline"), datetime):
+        row["deadline"] = row["deadline"].date()
+    elif row.get("deadline") in ("", None):
+        row["deadline"] = None
+    return row
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports internships for one company from a CSV or XLSX file. "
+        f"The first row names the columns: {', '.join(IMPORT_COLUMNS)}."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="A .csv or .xlsx file.")
+        parser.add_argument("--owner", required=True, help="Username of the company posting them.")
+        parser.add_argument("--batch-size", type=int, default=BULK_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            rows = _csv_rows(path)
+        elif extension == ".xlsx":
+            rows = _xlsx_rows(path)
+        else:
+            raise CommandError("Expected a .csv or .xlsx file")
+
+        try:
+            owner = get_user_model().objects.get(username=options["owner"])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No user named '{options['owner']}'")
+
+        header = [str(h or "").strip().lower() for h in next(rows, [])]
+        if "title" not in header or "description" not in header:
+            raise CommandError("The header row needs at least 'title' and 'description'")
+        columns = [(i, h) for i, h in enumerate(header) if h in IMPORT_COLUMNS]
+
+        numbered = (
+            (line, values) for line, values in enumerate(rows, start=2)  # line 1 is the header
+            if any(v not in (None, "") for v in values)
+        )
+        created = skipped = 0
+        while True:
+            batch = list(islice(numbered, options["batch_size"]))
+            if not batch:
+                break
+            records = [
+                _clean({h: (values[i] if i < len(values) else None) for i, h in columns})
+                for _, values in batch
+            ]
+            internships, errors = build_internships(owner, records)
+            for i, messages in errors.items():
+                self.stderr.write(f"Line {batch[i][0]} skipped: {messages}")
+            created += len(bulk_create_internships(internships, options["batch_size"]))
+            skipped += len(errors)
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} internship(s), skipped {skipped}."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from internships.models import Internship
+
+
+class Command(BaseCommand):
+    help = "Recomputes the denormalized applicant counters on every internship."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "ids", nargs="*", type=int,
+            help="Only recount these internships (default: all).",
+        )
+
+    def handle(self, *args, **options):
+        qs = Internship.objects.all()
+        if options["ids"]:
+            qs = qs.filter(pk__in=options["ids"])
+        updated = qs.recount_applicants()
+        self.stdout.write(self.style.SUCCESS(f"Recounted applicants for {updated} internship(s)."))
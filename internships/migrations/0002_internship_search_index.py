@@ -0,0 +1,51 @@
+# Full-text index over Internship.title / description / requirements.
+#
+# SQLite: an FTS5 virtual table, kept in sync by internships/signals.py.
+# Postgres: a GIN expression index; internships/search.py queries the
+# exact same expression so the planner can use it.
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS internships_internship_fts
+    USING fts5(title, description, requirements, tokenize='unicode61 remove_diacritics 2')
+    """,
+    """
+    INSERT INTO internships_internship_fts (rowid, title, description, requirements)
+    SELECT id, title, description, requirements FROM internships_internship
+    """,
+]
+SQLITE_BACKWARD = ["DROP TABLE IF EXISTS internships_internship_fts"]
+
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX IF NOT EXISTS internships_internship_search_idx
+    ON internships_internship USING GIN (
+        to_tsvector('english', coalesce(title, '') || ' ' ||
+        coalesce(description, '') || ' ' || coalesce(requirements, ''))
+    )
+    """,
+]
+POSTGRES_BACKWARD = ["DROP INDEX IF EXISTS internships_internship_search_idx"]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.7 on 2026-10-18 04:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Internship = apps.get_model('internships', 'Internship')
+    Application = apps.get_model('applications', 'Application')
+
+    def count(**filters):
+        return Coalesce(Subquery(
+            Application.objects
+            .filter(internship=OuterRef('pk'), **filters)
+            .order_by()
+            .values('internship')
+            .annotate(c=Count('pk'))
+            .values('c')
+        ), 0)
+
+    Internship.objects.update(
+        applicant_count=count(),
+        new_count=count(status='new'),
+        review_count=count(status='review'),
+        accepted_count=count(status='accepted'),
+        rejected_count=count(status='rejected'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0002_internship_search_index'),
+        ('applications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='accepted_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='applicant_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='new_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='rejected_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='internship',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-18 09:10
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_updated_at(apps, schema_editor):
+    Internship = apps.get_model('internships', 'Internship')
+    Internship.objects.update(updated_at=F('posted_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('internships', '0003_internship_applicant_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='internship',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
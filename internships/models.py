@@ -1,8 +1,58 @@
 from django.db import models
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+
+class InternshipQuerySet(models.QuerySet):
+    def for_cards(self):
+        """
+        Loads what a listing card or detail page shows about the
+        company (user + profile, incl. avatar) in the same query,
+        instead of two extra queries per internship.
+        """
+        return self.select_related("owner", "owner__profile")
+
+    def with_applied(self, student):
+        """
+        Annotates each internship with `applied` (has this student
+        applied?) as an EXISTS subquery, so it is only evaluated for
+        the rows actually fetched.
+        """
+        from applications.models import Application
+
+        return self.annotate(applied=Exists(
+            Application.objects.filter(student=student, internship=OuterRef("pk"))
+        ))
+
+    def recount_applicants(self):
+        """
+        Recomputes the denormalized applicant counters from the
+        applications table, in a single UPDATE over this queryset.
+        """
+        from applications.models import Application
+
+        def count(**filters):
+            return Coalesce(Subquery(
+                Application.objects
+                .filter(internship=OuterRef("pk"), **filters)
+                .order_by()
+                .values("internship")
+                .annotate(c=Count("pk"))
+                .values("c")
+            ), 0)
+
+        return self.update(
+            applicant_count=count(),
+            **{
+                f"{status}_count": count(status=status)
+                for status, _ in Application.STATUS_CHOICES
+            },
+        )
+
+
 class Internship(models.Model):
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="owned_internships")
     title = models.CharField(max_length=200)
@@ -11,8 +61,36 @@ class Internship(models.Model):
     description = models.TextField()
     requirements = models.TextField(blank=True)
     posted_at = models.DateTimeField(auto_now_add=True)
+    # Not touched by queryset.update() (e.g. the applicant counters),
+    # which is fine: it only backs the API's conditional GET validators.
+    updated_at = models.DateTimeField(auto_now=True)
     deadline = models.DateField(null=True, blank=True)
     is_active = models.BooleanField(default=True)
 
+    # Denormalized from applications_application so listings don't
+    # need a GROUP BY join. Maintained by applications/signals.py;
+    # `manage.py recount_applicants` rebuilds them.
+    applicant_count = models.PositiveIntegerField(default=0, editable=False)
+    new_count = models.PositiveIntegerField(default=0, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
+    accepted_count = models.PositiveIntegerField(default=0, editable=False)
+    rejected_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("applicant_count", "new_count", "review_count", "accepted_count", "rejected_count")
+
+    objects = InternshipQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.title}"
+
+    def save(self, *args, **kwargs):
+        # The counters change under concurrent applications while an
+        # edit form holds this instance, so a full save must not write
+        # back the values it loaded. Inserts and explicit update_fields
+        # are left as they are.
+        if not self._state.adding and kwargs.get("update_fields") is None and not kwargs.get("force_insert"):
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
@@ -0,0 +1,172 @@
+# internships/search.py
+import re
+
+from django.db import connections, router
+from django.db.models import F, FloatField, Func, Q, Value
+from django.db.models.expressions import RawSQL
+
+# The FTS5 table and the Postgres expression index are created by
+# migration 0002_internship_search_index. Keep these in sync with it.
+FTS_TABLE = "internships_internship_fts"
+
+PG_DOCUMENT = (
+    "to_tsvector('english', coalesce(title, '') || ' ' || "
+    "coalesce(description, '') || ' ' || coalesce(requirements, ''))"
+)
+
+# Per-column BM25 weights (title, description, requirements):
+# a hit in the title counts for far more than one in the description.
+BM25_WEIGHTS = (10.0, 1.0, 3.0)
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(q):
+    """
+    Splits a free-text query into lowercase word tokens.
+    Anything that isn't a word character is dropped, so the tokens
+    are always safe to embed in an FTS5 / tsquery expression.
+    """
+    return [t.lower() for t in TOKEN_RE.findall(q or "")]
+
+
+def _fts5_match(tokens):
+    # "tok"* -> prefix match, so results keep up while the user types.
+    return " ".join(f'"{t}"*' for t in tokens)
+
+
+def _tsquery(tokens):
+    return " & ".join(f"{t}:*" for t in tokens)
+
+
+def _fts_connection(model):
+    # The FTS5 table only exists on SQLite; Postgres keeps its
+    # expression index up to date by itself.
+    connection = connections[router.db_for_write(model)]
+    return connection if connection.vendor == "sqlite" else None
+
+
+def index_internships(internships):
+    """
+    (Re)writes the FTS5 rows for the given internships.
+    Called from the post_save signal, and directly after bulk inserts
+    (which don't send signals).
+    """
+    internships = list(internships)
+    if not internships:
+        return
+    connection = _fts_connection(type(internships[0]))
+    if connection is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+            [(i.pk,) for i in internships],
+        )
+        cursor.executemany(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, description, requirements) "
+            f"VALUES (%s, %s, %s, %s)",
+            [(i.pk, i.title, i.description, i.requirements) for i in internships],
+        )
+
+
+def unindex_internship(internship):
+    connection = _fts_connection(type(internship))
+    if connection is None:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [internship.pk])
+
+
+def search_internships(qs, q):
+    """
+    Restricts an Internship queryset to postings matching `q`.
+
+    Uses the SQLite FTS5 table or the Postgres tsvector index depending
+    on the database behind `qs`, so the lookup cost follows the number
+    of matches instead of the size of the table. Other backends fall
+    back to the old icontains scan.
+    """
+    tokens = tokenize(q)
+    if not tokens:
+        return qs if not (q or "").strip() else qs.none()
+
+    vendor = connections[qs.db].vendor
+    if vendor == "sqlite":
+        ids = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s",
+            [_fts5_match(tokens)],
+        )
+        return qs.filter(id__in=ids)
+
+    if vendor == "postgresql":
+        ids = RawSQL(
+            f"SELECT id FROM internships_internship "
+            f"WHERE {PG_DOCUMENT} @@ to_tsquery('english', %s)",
+            [_tsquery(tokens)],
+        )
+        return qs.filter(id__in=ids)
+
+    return qs.filter(
+        Q(title__icontains=q) |
+        Q(description__icontains=q) |
+        Q(requirements__icontains=q)
+    )
+
+
+class SearchRank(Func):
+    """
+    Relevance of the current row for a tokenized query; higher is better.
+
+    SQLite: FTS5's bm25(), which scores from the term statistics
+    (document counts, column lengths) that FTS5 stores and updates
+    incrementally as rows are indexed. Postgres: ts_rank_cd over the
+    same document expression as the GIN index.
+    """
+    output_field = FloatField()
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        super().__init__(F("pk"))
+
+    def as_sqlite(self, compiler, connection):
+        pk_sql, params = compiler.compile(self.source_expressions[0])
+        weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+        # bm25() is "more negative = better", so flip the sign.
+        sql = (
+            f"(SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {pk_sql})"
+        )
+        return sql, [_fts5_match(self.tokens), *params]
+
+    def as_postgresql(self, compiler, connection):
+        return (
+            f"ts_rank_cd({PG_DOCUMENT}, to_tsquery('english', %s))",
+            [_tsquery(self.tokens)],
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        # No ranking on other backends: every match scores the same.
+        return compiler.compile(Value(0.0))
+
+
+SORT_CHOICES = ("relevance", "recent")
+
+
+def resolve_sort(q, sort):
+    """
+    Relevance only means something with a query, and is
+    the default when there is one.
+    """
+    if not tokenize(q):
+        return "recent"
+    return sort if sort in SORT_CHOICES else "relevance"
+
+
+def rank_internships(qs, q):
+    """
+    Annotates a search_internships() queryset with `relevance`.
+    Paginate it by ("-relevance", "-id"): the database keeps only the
+    top rows of the ORDER BY ... LIMIT, nothing is ranked in Python.
+    """
+    return qs.annotate(relevance=SearchRank(tokenize(q)))
@@ -0,0 +1,91 @@
+# internships/signals.py
+
+# Keeps the full-text index, the browse caches, the cache tags
+# (elevate/cache_tags.py) and the autocomplete index in step with
+# Internship rows.
+
+from django.db import connection, transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+
+from . import autocomplete
+from elevate.cache_tags import INTERNSHIPS_LIST, company_tag, internship_tag, invalidate_tags
+from .models import Internship, User
+from .cache import bump_listing_version
+from .facets import invalidate_browse_facets
+from .search import index_internships, unindex_internship
+
+
+def _suggestions(is_active, title, location, company):
+    # What one internship contributes to the autocomplete index.
+    if not is_active:
+        return None
+    return {"titles": title, "locations": location, "companies": company}
+
+
+def _invalidate_listing():
+    invalidate_browse_facets()
+    return bump_listing_version()
+
+
+def invalidate_listing():
+    """
+    Drops the browse facets and bumps the listing version; returns the
+    new version (see cache.bump_listing_version). Inside a transaction
+    (admin, Wagtail snippets) both are done again on commit, like
+    invalidate_tags: another worker could have cached the old rows
+    under the new version in between. The autocomplete index then
+    sees a version it didn't apply and rebuilds.
+    """
+    version = _invalidate_listing()
+    if connection.in_atomic_block:
+        transaction.on_commit(_invalidate_listing)
+    return version
+
+
+@receiver(post_init, sender=Internship)
+def remember_listing(sender, instance, **kwargs):
+    # Read from __dict__ so deferred fields aren't fetched here.
+    d = instance.__dict__
+    instance._loaded_listing = (d.get("is_active"), d.get("title"), d.get("location"), d.get("owner_id"))
+
+
+@receiver(post_save, sender=Internship)
+def internship_saved(sender, instance, created, **kwargs):
+    index_internships([instance])
+    invalidate_tags(INTERNSHIPS_LIST, internship_tag(instance.pk), company_tag(instance.owner_id))
+    version = invalidate_listing()
+
+    # Only worth resolving usernames if this process has an index to update.
+    if autocomplete.index.version is not None:
+        old = None
+        is_active, title, location, owner_id = instance._loaded_listing
+        if not created:
+            if None in (is_active, title, owner_id):
+                version = None  # loaded with deferred fields: rebuild instead
+            else:
+                company = (
+                    instance.owner.username if owner_id == instance.owner_id
+                    else User.objects.filter(pk=owner_id).values_list("username", flat=True).first()
+                )
+                old = _suggestions(is_active, title, location, company)
+        new = _suggestions(instance.is_active, instance.title, instance.location, instance.owner.username)
+        autocomplete.index.apply_change(old, new, version)
+
+    instance._loaded_listing = (instance.is_active, instance.title, instance.location, instance.owner_id)
+
+
+@receiver(post_delete, sender=Internship)
+def internship_deleted(sender, instance, **kwargs):
+    unindex_internship(instance)
+    invalidate_tags(INTERNSHIPS_LIST, internship_tag(instance.pk), company_tag(instance.owner_id))
+    version = invalidate_listing()
+
+    if autocomplete.index.version is not None:
+        old = None
+        is_active, title, location, owner_id = instance._loaded_listing
+        if None in (is_active, title, owner_id):
+            version = None  # loaded with deferred fields: rebuild instead
+        else:
+            old = _suggestions(is_active, title, location, instance.owner.username)
+        autocomplete.index.apply_change(old, None, version)
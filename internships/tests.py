@@ -1,3 +1,223 @@
-from django.test import TestCase
+# internships/tests.py
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
 
-# Create your tests here.
+from .models import Internship
+from .search import search_internships
+
+User = get_user_model()
+
+
+@pytest.fixture
+def company():
+    return User.objects.create_user(username='acme', password='password')
+
+
+@pytest.mark.django_db
+def test_search_matches_title_description_and_requirements(company):
+    """
+    The full-text index covers all three text columns and
+    matches word prefixes (so typing 'pyth' finds 'Python').
+    """
+    a = Internship.objects.create(owner=company, title="Python Developer", description="Backend work")
+    b = Internship.objects.create(owner=company, title="Designer", description="Figma and branding")
+    c = Internship.objects.create(owner=company, title="Analyst", description="Reports", requirements="SQL, python")
+
+    qs = Internship.objects.all()
+    assert set(search_internships(qs, "pyth")) == {a, c}
+    assert set(search_internships(qs, "figma")) == {b}
+    assert set(search_internships(qs, "python sql")) == {c}
+
+
+@pytest.mark.django_db
+def test_search_index_follows_updates_and_deletes(company):
+    job = Internship.objects.create(owner=company, title="Marketing", description="Social media")
+    qs = Internship.objects.all()
+
+    job.title = "Growth"
+    job.save()
+    assert list(search_internships(qs, "marketing")) == []
+    assert list(search_internships(qs, "growth")) == [job]
+
+    job.delete()
+    assert list(search_internships(qs, "growth")) == []
+
+
+@pytest.mark.django_db
+def test_applicant_counters_follow_applications(company):
+    from applications.models import Application
+
+    job = Internship.objects.create(owner=company, title="Job", description="x")
+    students = [User.objects.create_user(username=f's{i}', password='password') for i in range(3)]
+    apps = [Application.objects.create(internship=job, student=s) for s in students]
+
+    apps[0].status = 'accepted'
+    apps[0].save()
+    Application.objects.only('id').get(pk=apps[1].pk).delete()
+
+    job.refresh_from_db()
+    assert (job.applicant_count, job.new_count, job.accepted_count) == (2, 1, 1)
+
+    # The recount command rebuilds the same numbers from scratch.
+    Internship.objects.update(applicant_count=0, new_count=0, accepted_count=0)
+    call_command('recount_applicants')
+    job.refresh_from_db()
+    assert (job.applicant_count, job.new_count, job.accepted_count) == (2, 1, 1)
+
+
+@pytest.mark.django_db
+def test_saving_a_stale_internship_keeps_the_counters(company):
+    from applications.models import Application
+
+    job = Internship.objects.create(owner=company, title="Job", description="x")
+    stale = Internship.objects.get(pk=job.pk)  # e.g. held by an edit form
+    Application.objects.create(internship=job, student=User.objects.create_user(username='s', password='password'))
+
+    stale.title = "Renamed"
+    stale.save()
+
+    job.refresh_from_db()
+    assert (job.title, job.applicant_count, job.new_count) == ("Renamed", 1, 1)
+
+
+@pytest.mark.django_db
+def test_listing_caches_are_invalidated_again_on_commit(company, django_capture_on_commit_callbacks):
+    from django.core.cache import cache
+    from .cache import get_listing_version
+    from .facets import BROWSE_FACETS_KEY, get_browse_facets
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Internship.objects.create(owner=company, title="Data Intern", description="x")
+        # Another worker reads between the save and the commit.
+        get_browse_facets()
+        version = get_listing_version()
+    assert cache.get(BROWSE_FACETS_KEY) is None
+    assert get_listing_version() != version
+
+
+@pytest.mark.django_db
+def test_rank_orders_title_hits_first_and_pages_by_relevance(company):
+    from elevate.pagination import CursorPaginator
+    from .search import rank_internships
+
+    in_title = Internship.objects.create(owner=company, title="Python Intern", description="Backend")
+    in_requirements = Internship.objects.create(owner=company, title="Analyst", description="Reports", requirements="python")
+    in_description = Internship.objects.create(owner=company, title="Designer", description="Some python scripting")
+    Internship.objects.create(owner=company, title="Unrelated", description="Nothing")
+
+    qs = rank_internships(search_internships(Internship.objects.all(), "python"), "python")
+    paginator = CursorPaginator(qs, 2, ("-relevance", "-id"))
+
+    first = paginator.page()
+    second = paginator.page(first.next_cursor)
+    assert list(first) + list(second) == [in_title, in_requirements, in_description]
+    assert not second.has_next()
+
+
+@pytest.mark.django_db
+def test_bulk_create_endpoint_is_all_or_nothing(client, company):
+    company.profile.role = 'company'
+    company.profile.save()
+    client.force_login(company)
+    url = "/api/ninja/internships/bulk"
+
+    bad = [
+        {"title": "Data Intern", "location": "Riyadh", "description": "x"},
+        {"title": "T" * 300, "location": "Riyadh", "description": "x"},
+    ]
+    response = client.post(url, bad, content_type="application/json")
+    assert response.status_code == 400
+    assert [r["errors"] is None for r in response.json()["results"]] == [True, False]
+    assert not Internship.objects.exists()
+
+    good = [{"title": f"Intern {i}", "location": "Riyadh", "description": "x"} for i in range(3)]
+    response = client.post(url, good, content_type="application/json")
+    assert response.json()["created"] == 3
+    ids = [r["id"] for r in response.json()["results"]]
+    assert list(Internship.objects.filter(owner=company).order_by("id").values_list("id", flat=True)) == ids
+    assert len(list(search_internships(Internship.objects.all(), "intern"))) == 3
+
+
+@pytest.mark.django_db
+def test_import_internships_from_csv_and_xlsx(company, tmp_path):
+    from openpyxl import Workbook
+
+    path = tmp_path / "jobs.csv"
+    path.write_text(
+        "Title,Location,Is_Remote,Description,Deadline\n"
+        "Python Intern,Riyadh,yes,Backend,2030-01-31\n"
+        "\n"
+        ",Jeddah,no,Missing a title,\n"
+    )
+    call_command("import_internships", str(path), owner="acme", batch_size=1)
+    job = Internship.objects.get()
+    assert (job.title, job.is_remote, str(job.deadline)) == ("Python Intern", True, "2030-01-31")
+
+    workbook = Workbook()
+    workbook.active.append(["title", "description", "requirements"])
+    for i in range(5):
+        workbook.active.append([f"Analyst {i}", "Reports", "SQL"])
+    workbook.save(tmp_path / "jobs.xlsx")
+    call_command("import_internships", str(tmp_path / "jobs.xlsx"), owner="acme", batch_size=2)
+    assert Internship.objects.count() == 6
+    assert len(list(search_internships(Internship.objects.all(), "sql"))) == 5
+
+
+@pytest.fixture(params=["locmem", "redis"])
+def tag_cache(request, settings):
+    """
+    A private cache, so tag versions start from scratch: in memory, and
+    the production RedisCache against an in-process fake Redis server.
+    """
+    if request.param == "redis":
+        fakeredis = pytest.importorskip("fakeredis")
+        settings.CACHES = {"default": {
+            "BACKEND": "elevate.cache_backends.RedisCache",
+            "LOCATION": "redis://localhost:6379/0",
+            "OPTIONS": {
+                "serializer": "elevate.cache_backends.CompressingSerializer",
+                "connection_class": fakeredis.FakeConnection,
+                "server": fakeredis.FakeServer(),
+            },
+        }}
+    else:
+        settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tags"}}
+    from django.core.cache import cache
+    cache.clear()
+    return cache
+
+
+@pytest.mark.django_db
+def test_model_changes_invalidate_cache_tags(company, tag_cache):
+    from applications.models import Application
+    from elevate.cache_tags import tagged_key
+
+    job = Internship.objects.create(owner=company, title="Job", description="x")
+    other = Internship.objects.create(owner=company, title="Other", description="x")
+    student = User.objects.create_user(username='sara', password='password')
+    tags = {
+        "list": ["internships:list"],
+        "job": [f"internship:{job.pk}"],
+        "other": [f"internship:{other.pk}"],
+        "company": [f"company:{company.pk}"],
+    }
+
+    def changed(action):
+        before = {name: tagged_key(name, t) for name, t in tags.items()}
+        action()
+        return {name for name, t in tags.items() if tagged_key(name, t) != before[name]}
+
+    def save_job():
+        job.title = "Data Intern"
+        job.save()
+
+    def make_company():
+        company.profile.role = 'company'
+        company.profile.save()
+
+    assert changed(save_job) == {"list", "job", "company"}
+    application = Application.objects.create(internship=job, student=student)
+    assert changed(lambda: Application.objects.filter(pk=application.pk).set_status('accepted')) == {"job", "company"}
+    assert changed(Application.objects.get(pk=application.pk).delete) == {"job", "company"}
+    assert changed(make_company) == {"list", "job", "other", "company"}
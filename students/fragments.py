@@ -0,0 +1,53 @@
+# students/fragments.py
+"""
+Server-side cache for the HTMX browse results fragment.
+
+The rendered `_internship_list.html` only depends on the filters, the
+cursor and who is looking (anonymous / student / company), so it is
+cached under those. Whether a student has already applied is the one
+per-user bit; it is left out of the cached HTML and overlaid afterwards.
+
+The key carries the internships:list tag (elevate/cache_tags.py), which
+internship changes and company profile changes (name, logo on every
+card) both invalidate.
+"""
+import re
+
+from django.template.loader import render_to_string
+
+from elevate.cache_policy import audience
+from elevate.cache_tags import INTERNSHIPS_LIST, tagged_key
+from internships.filters import BrowseFilters
+from internships.search import resolve_sort
+
+BROWSE_FRAGMENT_TIMEOUT = 60 * 10
+
+APPLY_LINK_RE = re.compile(r'<a [^>]*data-apply-for="(\d+)"[^>]*>.*?</a>', re.DOTALL)
+
+
+def browse_fragment_key(request):
+    params = request.GET
+    filters = BrowseFilters.from_params(params)
+    digest = filters.digest(
+        resolve_sort(filters.q, params.get("sort", "")),
+        params.get("cursor", ""),
+    )
+    return tagged_key(f"students:browse_fragment:{audience(request.user)}:{digest}", (INTERNSHIPS_LIST,))
+
+
+def apply_link_ids(html):
+    return {int(pk) for pk in APPLY_LINK_RE.findall(html)}
+
+
+def overlay_applied(html, applied_ids):
+    """
+    Replaces the "Apply now" links of the given internships
+    with the disabled "Applied" badge.
+    """
+    if not applied_ids:
+        return html
+    badge = render_to_string("students/partials/_applied_button.html").strip()
+    return APPLY_LINK_RE.sub(
+        lambda m: badge if int(m.group(1)) in applied_ids else m.group(0),
+        html,
+    )
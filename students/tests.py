@@ -1,3 +1,352 @@
-from django.test import TestCase
+# students/tests.py
+import json
+import pytest
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
 
-# Create your tests here.
+from internships.facets import BROWSE_FACETS_KEY, get_browse_facets
+from internships.models import Internship
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def company():
+    user = User.objects.create_user(username='acme', password='password')
+    user.profile.role = 'company'
+    user.profile.save()
+    return user
+
+
+@pytest.mark.django_db
+def test_browse_facets_are_cached_and_invalidated(company):
+    """
+    The title/location/company counts are computed once, then
+    served from the cache until an internship changes.
+    """
+    Internship.objects.create(owner=company, title="Data Intern", location="Riyadh", description="x")
+
+    assert get_browse_facets()['titles'] == {"Data Intern": 1}
+    assert cache.get(BROWSE_FACETS_KEY) is not None
+
+    Internship.objects.create(owner=company, title="Web Intern", location="Riyadh", description="x")
+    assert cache.get(BROWSE_FACETS_KEY) is None
+    assert get_browse_facets()['locations'] == {"Riyadh": 2}
+
+
+@pytest.mark.django_db
+def test_autocomplete_follows_internship_changes(client, company):
+    url = reverse('api-1.0.0:autocomplete_filters')
+    job = Internship.objects.create(owner=company, title="Data Intern", location="Riyadh", description="x")
+    Internship.objects.create(owner=company, title="Database Admin", location="Jeddah", description="x")
+
+    assert client.get(url, {"q": "dat", "field": "title"}).json()["titles"] == ["Data Intern", "Database Admin"]
+
+    # Incremental update in this process, no rebuild needed.
+    job.title = "Web Intern"
+    job.save()
+    with CaptureQueriesContext(connection) as queries:
+        data = client.get(url, {"q": "w"}).json()
+    assert len(queries) == 0
+    assert data == {"titles": ["Web Intern"], "locations": [], "companies": []}
+    assert client.get(url, {"q": "ACM"}).json()["companies"] == ["acme"]
+
+    job.delete()
+    assert client.get(url, {"q": "riy", "field": "location"}).json()["locations"] == []
+
+
+@pytest.mark.django_db
+def test_htmx_browse_skips_facets(client, company):
+    Internship.objects.create(owner=company, title="Data Intern", description="x")
+
+    response = client.get(reverse('student_browse'), HTTP_HX_REQUEST='true')
+    assert response.status_code == 200
+    assert cache.get(BROWSE_FACETS_KEY) is None
+
+
+@pytest.mark.django_db
+def test_browse_cursor_pagination_walks_forward_and_back(client, company):
+    """
+    Keyset pagination: follow next/previous cursors through
+    all postings (newest first) without skipping or repeating.
+    """
+    jobs = [
+        Internship.objects.create(owner=company, title=f"Job {i}", description="x")
+        for i in range(14)
+    ]
+    newest_first = [j.pk for j in reversed(jobs)]
+    url = reverse('student_browse')
+
+    seen, pages, cursor = [], [], None
+    while True:
+        response = client.get(url, {"cursor": cursor} if cursor else {})
+        page = response.context['page_obj']
+        seen += [j.pk for j in page.object_list]
+        pages.append(page)
+        if not page.has_next():
+            break
+        cursor = page.next_cursor
+    assert seen == newest_first
+    assert len(pages) == 3
+
+    last = pages[-1]
+    response = client.get(url, {"cursor": last.previous_cursor})
+    assert [j.pk for j in response.context['page_obj'].object_list] == newest_first[6:12]
+
+
+@pytest.mark.django_db
+def test_api_internships_cursor_header(client, company):
+    for i in range(3):
+        Internship.objects.create(owner=company, title=f"Job {i}", description="x")
+
+    response = client.get("/api/ninja/internships", {"limit": 2})
+    assert [j["title"] for j in response.json()] == ["Job 2", "Job 1"]
+
+    response = client.get("/api/ninja/internships", {"limit": 2, "cursor": response["X-Next-Cursor"]})
+    assert [j["title"] for j in response.json()] == ["Job 0"]
+    assert "X-Next-Cursor" not in response
+
+    assert client.get("/api/ninja/internships", {"cursor": "bogus"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_browse_card_query_count_does_not_grow_with_page_size(client, company):
+    """
+    Owner + owner profile come in with the internships, so a page
+    of 6 cards costs exactly the same queries as a page of 1.
+    """
+    url = reverse('student_browse')
+    Internship.objects.create(owner=company, title="Job", description="x")
+    with CaptureQueriesContext(connection) as one_card:
+        client.get(url, HTTP_HX_REQUEST='true')
+
+    for i in range(5):
+        other = User.objects.create_user(username=f'company{i}', password='password')
+        Internship.objects.create(owner=other, title=f"Job {i}", description="x")
+    with CaptureQueriesContext(connection) as six_cards:
+        response = client.get(url, HTTP_HX_REQUEST='true')
+
+    assert len(response.context['page_obj'].object_list) == 6
+    assert len(six_cards) == len(one_card)
+
+
+@pytest.mark.django_db
+def test_htmx_browse_fragment_is_cached_and_overlays_applied(client, company):
+    """
+    HTMX result pages come from the fragment cache until an internship
+    changes; a student's "Applied" badges are overlaid per request.
+    """
+    from applications.models import Application
+
+    url = reverse('student_browse')
+    job = Internship.objects.create(owner=company, title="Data Intern", description="x")
+    client.get(url, {"q": "data"}, HTTP_HX_REQUEST='true')
+
+    # Same filters, differently spelled: served without touching the DB.
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"q": "  DATA "}, HTTP_HX_REQUEST='true')
+    assert len(queries) == 0
+    assert b"Data Intern" in response.content
+
+    Internship.objects.create(owner=company, title="Data Analyst", description="x")
+    response = client.get(url, {"q": "data"}, HTTP_HX_REQUEST='true')
+    assert b"Data Analyst" in response.content
+
+    student = User.objects.create_user(username='sara', password='password')
+    student.profile.role = 'student'
+    student.profile.save()
+    Application.objects.create(internship=job, student=student)
+    client.force_login(student)
+
+    for _ in range(2):  # cache miss, then hit
+        response = client.get(url, {"q": "data"}, HTTP_HX_REQUEST='true')
+        assert response.content.count(b"Applied") == 1
+        assert response.content.count(b"Apply now") == 1
+
+
+@pytest.mark.django_db
+def test_htmx_browse_fragment_follows_company_profile_changes(client, company, settings, tmp_path):
+    settings.STORAGES = {**settings.STORAGES, "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+        "OPTIONS": {"location": str(tmp_path), "base_url": "/media/"},
+    }}
+    url = reverse('student_browse')
+    Internship.objects.create(owner=company, title="Data Intern", description="x")
+    client.get(url, HTTP_HX_REQUEST='true')
+
+    company.profile.avatar = "avatars/acme.png"
+    company.profile.save()
+    assert b"/media/avatars/acme.png" in client.get(url, HTTP_HX_REQUEST='true').content
+
+
+@pytest.mark.django_db
+def test_applied_flags_on_detail_and_api(client, company):
+    from applications.models import Application
+
+    applied, other = (
+        Internship.objects.create(owner=company, title=t, description="x")
+        for t in ("Applied Job", "Other Job")
+    )
+    student = User.objects.create_user(username='sara', password='password')
+    student.profile.role = 'student'
+    student.profile.save()
+    Application.objects.create(internship=applied, student=student)
+    client.force_login(student)
+
+    assert client.get(reverse('student_detail', args=[applied.pk])).context['already_applied']
+    assert not client.get(reverse('student_detail', args=[other.pk])).context['already_applied']
+
+    flags = {j["title"]: j["applied"] for j in client.get("/api/ninja/internships").json()}
+    assert flags == {"Applied Job": True, "Other Job": False}
+
+
+@pytest.mark.django_db
+def test_facet_counts_follow_filters_in_one_query(client, company):
+    from internships.facets import get_facet_counts
+    from internships.filters import BrowseFilters
+
+    Internship.objects.create(owner=company, title="Data Intern", location="Riyadh", is_remote=True, description="x")
+    Internship.objects.create(owner=company, title="Data Analyst", location="Jeddah", description="x")
+    Internship.objects.create(owner=company, title="Web Intern", location="Riyadh", description="x")
+
+    filters = BrowseFilters.from_params({"q": "data"})
+    with CaptureQueriesContext(connection) as queries:
+        counts = get_facet_counts(filters)
+    assert len(queries) == 1
+    assert counts == {
+        "locations": {"Jeddah": 1, "Riyadh": 1},
+        "companies": {"acme": 2},
+        "remote": {"1": 1, "0": 1},
+    }
+
+    response = client.get(reverse('student_browse'), {"loc": "riyadh"})
+    assert response.context['facet_counts']['remote'] == {"1": 1, "0": 1}
+    assert b"Remote Only (1)" in response.content
+
+    response = client.get("/api/ninja/internships", {"q": "data", "facets": "true"})
+    assert json.loads(response["X-Facet-Counts"]) == counts
+
+
+@pytest.mark.django_db
+def test_api_internships_conditional_get(client, company):
+    url = "/api/ninja/internships"
+    job = Internship.objects.create(owner=company, title="Data Intern", description="x")
+
+    response = client.get(url)
+    etag = response["ETag"]
+    assert "max-age=0" in response["Cache-Control"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+    assert len(queries) == 1  # just the validator aggregate
+
+    job.title = "Web Intern"
+    job.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_api_internships_revalidation_sees_removed_postings(client, company):
+    url = "/api/ninja/internships"
+    kept = Internship.objects.create(owner=company, title="Data Intern", description="x")
+    removed = Internship.objects.create(owner=company, title="Web Intern", description="x")
+    first = client.get(url)
+    # The newest update in the set can't tell that a row left it.
+    assert not first.has_header("Last-Modified")
+
+    Internship.objects.filter(pk=removed.pk).update(is_active=False)
+    for headers in ({"HTTP_IF_NONE_MATCH": first["ETag"]}, {"HTTP_IF_MODIFIED_SINCE": http_date()}):
+        response = client.get(url, **headers)
+        assert response.status_code == 200
+        assert [job["id"] for job in response.json()] == [kept.pk]
+
+
+@pytest.mark.django_db
+def test_api_internships_filters_and_sparse_fields(client, company):
+    Internship.objects.create(owner=company, title="Data Intern", location="Riyadh", is_remote=True, description="x" * 500)
+    Internship.objects.create(owner=company, title="Data Analyst", location="Jeddah", description="x")
+    Internship.objects.create(owner=company, title="Web Intern", location="Riyadh", description="x")
+
+    url = "/api/ninja/internships"
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url, {"q": "data", "loc": "riyadh", "fields": "id,title"})
+    assert [set(j) for j in response.json()] == [{"id", "title"}]
+    assert response.json()[0]["title"] == "Data Intern"
+    listing_sql = queries.captured_queries[-1]["sql"]
+    assert "description" not in listing_sql
+
+    titles = [j["title"] for j in client.get(url, {"remote": "false", "fields": "title"}).json()]
+    assert titles == ["Web Intern", "Data Analyst"]
+    assert client.get(url, {"comp": "acm", "limit": 1}).json()[0]["applied"] is False
+    assert client.get(url, {"fields": "id,owner"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_public_pages_are_served_from_the_response_cache(client, company):
+    job = Internship.objects.create(owner=company, title="Data Intern", description="x")
+    browse, detail = reverse('student_browse'), reverse('student_detail', args=[job.pk])
+
+    for url in (browse, detail):
+        client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+        assert len(queries) == 0
+        assert b"Data Intern" in response.content
+        assert "no-cache" in response["Cache-Control"]
+
+    # Saving the internship drops both.
+    job.title = "Web Intern"
+    job.save()
+    assert b"Web Intern" in client.get(browse).content
+    assert b"Web Intern" in client.get(detail).content
+
+
+@pytest.mark.django_db
+def test_personalised_pages_are_not_shared(client, company):
+    from applications.models import Application
+
+    job = Internship.objects.create(owner=company, title="Data Intern", description="x")
+    url = reverse('student_detail', args=[job.pk])
+    client.get(url)  # cached for anonymous visitors
+
+    student = User.objects.create_user(username='sara', password='password')
+    student.profile.role = 'student'
+    student.profile.save()
+    Application.objects.create(internship=job, student=student)
+    client.force_login(student)
+    assert client.get(url).context["already_applied"] is True
+
+    # Logged-in pages carry the logout form's CSRF token: never stored.
+    client.force_login(company)
+    client.get(url)
+    with CaptureQueriesContext(connection) as queries:
+        client.get(url)
+    assert len(queries) > 0
+
+
+@pytest.mark.django_db
+def test_api_internships_anonymous_pages_are_cached(client, company):
+    url = "/api/ninja/internships"
+    Internship.objects.create(owner=company, title="Data Intern", description="x")
+    first = client.get(url, {"limit": 1, "facets": "true"})
+
+    with CaptureQueriesContext(connection) as queries:
+        second = client.get(url, {"limit": 1, "facets": "true"})
+    assert len(queries) == 1  # the ETag aggregate only
+    assert second.json() == first.json()
+    assert second["X-Facet-Counts"] == first["X-Facet-Counts"]
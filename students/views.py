@@ -1,5 +1,7 @@
 # students/views.py
-from django.db.models import Q, Count
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.contrib import messages
 from django.views.generic import ListView, DetailView, FormView
@@ -8,42 +10,61 @@ from django.views.decorators.cache import never_cache
 from django.utils.decorators import method_decorator
 
 from accounts.mixins import RoleRequiredMixin
+from elevate.cache_compute import get_or_compute
+from elevate.cache_policy import CachePolicy
+from elevate.cache_tags import INTERNSHIPS_LIST
+from elevate.pagination import CursorPaginationMixin
 from internships.models import Internship
+from internships.facets import get_facet_counts
+from internships.filters import BrowseFilters
+from internships.search import rank_internships, resolve_sort
 from applications.models import Application
 from applications.forms import ApplicationCreateForm
+from applications.uploads import UploadRejected, claim_upload
+from .fragments import (
+    BROWSE_FRAGMENT_TIMEOUT, apply_link_ids, browse_fragment_key, overlay_applied,
+)
 
 # 1) OPEN PAGES (no login required)
 
-@method_decorator(never_cache, name='dispatch')
-class StudentBrowseView(ListView):
+# Students see their own "Applied" badges, so only anonymous visitors and
+# companies share cached pages (see elevate/cache_policy.py).
+BROWSE_CACHE = CachePolicy(
+    "student_browse", 60 * 10, vary=("role", "htmx"),
+    tags=(INTERNSHIPS_LIST,), audiences=("anonymous", "company"),
+)
+ACTIVE_COUNT_TIMEOUT = 60 * 10
+DETAIL_CACHE = CachePolicy(
+    "student_detail", 60 * 15, params=(),
+    tags=("internship:{pk}",), audiences=("anonymous", "company"),
+)
+
+
+@method_decorator(BROWSE_CACHE, name='dispatch')
+class StudentBrowseView(CursorPaginationMixin, ListView):
     template_name = "students/browse.html"
     context_object_name = "internships"
     paginate_by = 6
     model = Internship
+    fragment_caching = False
 
     def get_queryset(self):
-        qs = Internship.objects.filter(is_active=True).order_by("-posted_at")
-        qs = qs.annotate(applicant_count=Count('applications')) 
-        self.total_count = qs.count() 
+        qs = Internship.objects.filter(is_active=True).for_cards().order_by("-posted_at")
+        self.total_count = get_or_compute(
+            "internships:active_count", qs.count, ACTIVE_COUNT_TIMEOUT, tags=(INTERNSHIPS_LIST,),
+        )
         
-        q = self.request.GET.get("q", "")
-        loc = self.request.GET.get("loc", "")
-        comp = self.request.GET.get("comp", "")
-        remote_filter = self.request.GET.get("remote_filter", "")
-
-        if q:
-            qs = qs.filter(
-                Q(title__icontains=q) |
-                Q(description__icontains=q)
-            )
-        if loc:
-            qs = qs.filter(location__icontains=loc) 
-        if comp:
-            qs = qs.filter(owner__username__icontains=comp) 
-        if remote_filter == "1":
-            qs = qs.filter(is_remote=True)
-        elif remote_filter == "0":
-            qs = qs.filter(is_remote=False)
+        self.filters = BrowseFilters.from_params(self.request.GET)
+        qs = self.filters.apply(qs)
+
+        self.sort = resolve_sort(self.filters.q, self.request.GET.get("sort", ""))
+        if self.sort == "relevance":
+            qs = rank_internships(qs, self.filters.q)
+
+        # A fragment-cache render must not bake in one student's
+        # applications; get() overlays those afterwards.
+        if self.is_student() and not self.fragment_caching:
+            qs = qs.with_applied(self.request.user)
             
         return qs
 
@@ -54,39 +75,54 @@ class StudentBrowseView(ListView):
         ctx["loc"] = self.request.GET.get("loc", "")
         ctx["comp"] = self.request.GET.get("comp", "")
         ctx["remote_filter"] = self.request.GET.get("remote_filter", "")
-        
-        active_internships = Internship.objects.filter(is_active=True)
-        
-        ctx["all_titles"] = active_internships.values_list(
-            'title', flat=True
-        ).distinct().order_by('title')
-        
-        ctx["all_locations"] = active_internships.exclude(
-            location__exact=''
-        ).values_list('location', flat=True).distinct().order_by('location')
-        
-        ctx["all_companies"] = active_internships.values_list(
-            'owner__username', flat=True
-        ).distinct().order_by('owner__username')
-        
-        # Get a list of internship IDs that the logged-in student has applied to.
-        applied_internship_ids = []
-        if self.request.user.is_authenticated and self.request.user.profile.is_student:
-            applied_internship_ids = Application.objects.filter(
-                student=self.request.user
-            ).values_list('internship_id', flat=True)
-        
-        ctx['applied_internship_ids'] = set(applied_internship_ids)
+        ctx["sort"] = self.sort
+        # Only the full page renders the filter bar.
+        if not self.is_htmx_request():
+            ctx["facet_counts"] = get_facet_counts(self.filters)
         
         return ctx
     
+    def get_cursor_ordering(self):
+        if self.sort == "relevance":
+            return ("-relevance", "-id")
+        return super().get_cursor_ordering()
+
+    def is_htmx_request(self):
+        return self.request.headers.get('HX-Request') == 'true'
+
+    def is_student(self):
+        user = self.request.user
+        return user.is_authenticated and user.profile.is_student
+
+    def get(self, request, *args, **kwargs):
+        """
+        HTMX result pages are served from the fragment cache
+        (see students/fragments.py); full pages render as usual.
+        """
+        if not self.is_htmx_request():
+            return super().get(request, *args, **kwargs)
+
+        key = browse_fragment_key(request)
+        html = cache.get(key)
+        if html is None:
+            self.fragment_caching = True
+            html = super().get(request, *args, **kwargs).rendered_content
+            cache.set(key, html, BROWSE_FRAGMENT_TIMEOUT)
+
+        if self.is_student():
+            applied_ids = set(Application.objects.filter(
+                student=request.user, internship_id__in=apply_link_ids(html)
+            ).values_list('internship_id', flat=True))
+            html = overlay_applied(html, applied_ids)
+        return HttpResponse(html)
+
     def get_template_names(self):
         """
         This is the "brain" for HTMX.
         It checks if the request is from HTMX by looking for the 'HX-Request' header.
         """
         
-        if self.request.headers.get('HX-Request') == 'true':
+        if self.is_htmx_request():
             # If it's an HTMX request, render *only* the partial.
             return ["students/partials/_internship_list.html"]
         
@@ -94,27 +130,29 @@ class StudentBrowseView(ListView):
         return [self.template_name]
 
 
-@method_decorator(never_cache, name='dispatch')
+@method_decorator(DETAIL_CACHE, name='dispatch')
 class StudentDetailView(DetailView):
     template_name = "students/detail.html"
     context_object_name = "job"
     model = Internship
 
+    def get_queryset(self):
+        qs = Internship.objects.for_cards()
+        user = self.request.user
+        if user.is_authenticated and hasattr(user, 'profile') and user.profile.is_student:
+            qs = qs.annotate(applied_at=Subquery(
+                Application.objects
+                .filter(internship=OuterRef('pk'), student=user)
+                .values('submitted_at')[:1]
+            ))
+        return qs
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
-        already = False
-        submitted_at = None
-        if self.request.user.is_authenticated:
-            # We get the profile here to be safe
-            if hasattr(self.request.user, 'profile') and self.request.user.profile.is_student:
-                application = Application.objects.filter(
-                    internship=self.object, student=self.request.user
-                ).first()
-                if application:
-                    already = True
-                    submitted_at = application.submitted_at
-        ctx["already_applied"] = already
-        ctx["submitted_at"] = submitted_at 
+        # Annotated by get_queryset() for students; None otherwise.
+        submitted_at = getattr(self.object, 'applied_at', None)
+        ctx["already_applied"] = submitted_at is not None
+        ctx["submitted_at"] = submitted_at
         return ctx
 
 # 2) LOGIN-ONLY PAGES
@@ -134,10 +172,47 @@ class StudentApplyView(LoginRequiredMixin, FormView):
         
         return super().dispatch(request, *args, **kwargs)
 
+    def get_form_kwargs(self):
+        kwargs = super().get_form_kwargs()
+        kwargs["profile"] = self.request.user.profile
+        kwargs["upload_errors"] = getattr(self.request, "upload_errors", None)
+        return kwargs
+
     def get_context_data(self, **kwargs):
         ctx = super().get_context_data(**kwargs)
         ctx["job"] = self.job
+        ctx["profile_cv"] = self.request.user.profile.cv
         return ctx
+
+    def post(self, request, *args, **kwargs):
+        # With JavaScript the files went straight to storage
+        # (applications/uploads.py) and only their keys are posted.
+        if request.POST.get("cv_key") or request.POST.get("cover_letter_key"):
+            return self.apply_with_uploads()
+        return super().post(request, *args, **kwargs)
+
+    def apply_with_uploads(self):
+        student, post = self.request.user, self.request.POST
+        profile_cv = student.profile.cv
+        try:
+            if post.get("cv_key"):
+                cv = claim_upload(self.job, student, "cv", post["cv_key"])
+            elif post.get("use_profile_cv") and profile_cv:
+                # Only the cover letter was uploaded directly.
+                cv = profile_cv.name
+            else:
+                raise UploadRejected("Please upload your CV.")
+            cover_letter = post.get("cover_letter_key") and claim_upload(self.job, student, "cover_letter", post["cover_letter_key"])
+        except UploadRejected as e:
+            messages.error(self.request, str(e))
+            return redirect("student_apply", pk=self.job.pk)
+
+        if Application.objects.filter(internship=self.job, student=student).exists():
+            messages.info(self.request, "You’ve already applied to this internship.")
+            return redirect("student_detail", pk=self.job.pk)
+        Application.objects.create(internship=self.job, student=student, cv=cv, cover_letter=cover_letter or None)
+        messages.success(self.request, "Application submitted successfully.")
+        return redirect("student_apps")
     
     def form_valid(self, form):
         """
@@ -13,6 +13,23 @@ from wagtail import blocks
 
 from wagtail.api import APIField
 
+from elevate.cache_policy import CachePolicy
+from elevate.cache_tags import SITE_SETTINGS
+
+
+class CachedPageMixin:
+    """
+    Serves the page from the response cache (elevate/cache_policy.py)
+    until it is republished or the site settings change.
+    """
+    cache_policy = CachePolicy("wagtail_page", 60 * 15, params=(), tags=("page:{pk}", SITE_SETTINGS))
+
+    def serve(self, request, *args, **kwargs):
+        return self.cache_policy.respond(
+            request, lambda: super(CachedPageMixin, self).serve(request, *args, **kwargs),
+            pk=self.pk,
+        )
+
 @register_setting
 class SiteSettings(BaseSiteSetting):
     # Keep global/brand here so every page gets the same header/footer easily
@@ -25,7 +42,7 @@ class SiteSettings(BaseSiteSetting):
         MultiFieldPanel([FieldPanel("header_bg"), FieldPanel("footer_bg")], heading="Backgrounds"),
     ]
 
-class LandingPage(Page):
+class LandingPage(CachedPageMixin, Page):
     # Fields so editors can edit the landing page directly
     hero_title = models.CharField(max_length=160, blank=True)
     hero_lead = models.TextField(blank=True)
@@ -200,7 +217,7 @@ class WhatWeOfferSectionBlock(blocks.StructBlock):
         icon = 'table'
         label = 'What We Offer Section'
 
-class AboutPage(Page):
+class AboutPage(CachedPageMixin, Page):
     # Main heading and subheading
     page_heading = models.CharField(max_length=100, default="About Elevate")
     sub_heading = models.CharField(max_length=150, blank=True, default="Empowering Students. Connecting Opportunities.")
@@ -0,0 +1,25 @@
+# website/signals.py
+
+# Drops cached Wagtail pages (CachedPageMixin) when they are published
+# or unpublished, and all of them when the site settings change.
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from wagtail.signals import page_published, page_unpublished
+
+from elevate.cache_tags import SITE_SETTINGS, invalidate_tags, page_tag
+from .models import SiteSettings
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def page_changed(sender, instance, **kwargs):
+    invalidate_tags(page_tag(instance.pk))
+
+
+@receiver(post_save, sender=SiteSettings)
+def site_settings_saved(sender, instance, created, **kwargs):
+    # The row is created with its defaults on the first page view;
+    # nothing shown changes, so no cached page needs to go.
+    if not created:
+        invalidate_tags(SITE_SETTINGS)
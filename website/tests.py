@@ -1,3 +1,48 @@
-from django.test import TestCase
+# website/tests.py
+import pytest
 
-# Create your tests here.
+
+@pytest.fixture
+def about_page(db):
+    from wagtail.models import Site
+    from .models import AboutPage
+
+    page = AboutPage(title="About", slug="about-us", page_heading="About Elevate")
+    Site.objects.get(is_default_site=True).root_page.add_child(instance=page)
+    page.save_revision().publish()
+    return page
+
+
+def test_about_page_api_conditional_get(client, about_page):
+    url = "/api/ninja/pages/about"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.json()["page_heading"] == "About Elevate"
+    etag = response["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    assert client.get(url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]).status_code == 304
+
+    about_page.page_heading = "About us"
+    about_page.save_revision().publish()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()["page_heading"] == "About us"
+
+
+def test_publishing_a_page_drops_its_cached_response(client, about_page, django_capture_on_commit_callbacks):
+    from .models import AboutPage
+
+    url = about_page.url
+    assert b"About Elevate" in client.get(url).content
+    # A change that bypasses publishing isn't seen: the response is cached.
+    AboutPage.objects.filter(pk=about_page.pk).update(page_heading="Changed quietly")
+    assert b"About Elevate" in client.get(url).content
+
+    about_page.page_heading = "About us"
+    with django_capture_on_commit_callbacks(execute=True):
+        about_page.save_revision().publish()
+    assert b"About us" in client.get(url).content
+
+    with django_capture_on_commit_callbacks(execute=True):
+        about_page.unpublish()
+    assert client.get(url).status_code == 404